@@ -0,0 +1,30 @@
+"""hot path indexes
+
+Revision ID: 3b8f1d2c9a47
+Revises: 5472079a26d0
+Create Date: 2026-10-16 09:12:31.402118
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '3b8f1d2c9a47'
+down_revision: Union[str, None] = '5472079a26d0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_company_notifications_company_status_created', 'company_notifications', ['company_id', 'status', sa.text('created_at DESC')], unique=False)
+    op.drop_index('unique_active_company_membership', table_name='company_memberships', postgresql_where=sa.text("status = 'active'"))
+    op.create_index('unique_active_company_membership', 'company_memberships', ['company_id'], unique=True, postgresql_where=sa.text("status = 'active'"), postgresql_include=['end_date', 'membership_plan_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('unique_active_company_membership', table_name='company_memberships', postgresql_where=sa.text("status = 'active'"))
+    op.create_index('unique_active_company_membership', 'company_memberships', ['company_id'], unique=True, postgresql_where=sa.text("status = 'active'"))
+    op.drop_index('ix_company_notifications_company_status_created', table_name='company_notifications')
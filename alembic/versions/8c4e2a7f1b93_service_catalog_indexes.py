@@ -0,0 +1,30 @@
+"""service catalog indexes
+
+Revision ID: 8c4e2a7f1b93
+Revises: 3b8f1d2c9a47
+Create Date: 2026-10-16 14:37:05.218644
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = '8c4e2a7f1b93'
+down_revision: Union[str, None] = '3b8f1d2c9a47'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(op.f('ix_company_categories_company_id'), 'company_categories', ['company_id'], unique=False)
+    op.create_index(op.f('ix_category_services_category_id'), 'category_services', ['category_id'], unique=False)
+    op.create_index(op.f('ix_service_staff_user_id'), 'service_staff', ['user_id'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index(op.f('ix_service_staff_user_id'), table_name='service_staff')
+    op.drop_index(op.f('ix_category_services_category_id'), table_name='category_services')
+    op.drop_index(op.f('ix_company_categories_company_id'), table_name='company_categories')
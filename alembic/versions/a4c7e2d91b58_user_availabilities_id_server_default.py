@@ -0,0 +1,27 @@
+"""user availabilities id server default
+
+Revision ID: a4c7e2d91b58
+Revises: f3b9e1c4a862
+Create Date: 2026-10-16 21:12:07.415892
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a4c7e2d91b58'
+down_revision: Union[str, None] = 'f3b9e1c4a862'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built into PostgreSQL 13+
+    op.alter_column('user_availabilities', 'id', existing_type=sa.UUID(), server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    op.alter_column('user_availabilities', 'id', existing_type=sa.UUID(), server_default=None)
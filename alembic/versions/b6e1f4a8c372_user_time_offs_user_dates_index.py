@@ -0,0 +1,26 @@
+"""user time offs user dates index
+
+Revision ID: b6e1f4a8c372
+Revises: a4c7e2d91b58
+Create Date: 2026-10-16 21:48:53.207614
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e1f4a8c372'
+down_revision: Union[str, None] = 'a4c7e2d91b58'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_user_time_offs_user_dates', 'user_time_offs', ['user_id', 'start_date', 'end_date'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_user_time_offs_user_dates', table_name='user_time_offs')
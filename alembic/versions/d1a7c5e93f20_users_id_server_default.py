@@ -0,0 +1,27 @@
+"""users id server default
+
+Revision ID: d1a7c5e93f20
+Revises: 8c4e2a7f1b93
+Create Date: 2026-10-16 18:05:42.913370
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd1a7c5e93f20'
+down_revision: Union[str, None] = '8c4e2a7f1b93'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # gen_random_uuid() is built into PostgreSQL 13+
+    op.alter_column('users', 'id', existing_type=sa.UUID(), server_default=sa.text('gen_random_uuid()'))
+
+
+def downgrade() -> None:
+    op.alter_column('users', 'id', existing_type=sa.UUID(), server_default=None)
@@ -0,0 +1,43 @@
+"""category services leaf category trigger
+
+Revision ID: f3b9e1c4a862
+Revises: d1a7c5e93f20
+Create Date: 2026-10-16 18:11:26.540817
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f3b9e1c4a862'
+down_revision: Union[str, None] = 'd1a7c5e93f20'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # Services may only be added to categories without subcategories
+    op.execute("""
+        CREATE FUNCTION category_services_leaf_category() RETURNS trigger AS $$
+        BEGIN
+            IF EXISTS (SELECT 1 FROM company_categories WHERE parent_category_id = NEW.category_id) THEN
+                RAISE EXCEPTION 'category % has subcategories', NEW.category_id
+                    USING ERRCODE = 'check_violation';
+            END IF;
+            RETURN NEW;
+        END;
+        $$ LANGUAGE plpgsql
+    """)
+    op.execute("""
+        CREATE TRIGGER category_services_leaf_category
+        BEFORE INSERT OR UPDATE OF category_id ON category_services
+        FOR EACH ROW EXECUTE FUNCTION category_services_leaf_category()
+    """)
+
+
+def downgrade() -> None:
+    op.execute("DROP TRIGGER category_services_leaf_category ON category_services")
+    op.execute("DROP FUNCTION category_services_leaf_category()")
@@ -296,7 +296,8 @@ async def get_company_services(
         db=db, company_id=company_id
     )
 
-    return DataResponse.success_response(
+    # The tree is already plain dicts in the response shape, serialise it without re-validating
+    return DataResponse.raw_success_response(
         data=services,
         message="Company services retrieved successfully",
         status_code=status.HTTP_200_OK
@@ -1299,6 +1300,7 @@ async def check_invitation_and_join(
                 invitation.updated_at = datetime.now()
                 db.add(invitation)
                 await db.commit()
+                await crud_invitation.invalidate_cached_invitation(token)
 
                 return DataResponse.success_response(
                     message="User successfully joined the company",
@@ -1330,6 +1332,7 @@ async def check_invitation_and_join(
         invitation.updated_at = datetime.now()
         db.add(invitation)
         await db.commit()
+        await crud_invitation.invalidate_cached_invitation(token)
 
         # User exists and has been added to company
         return DataResponse.success_response(
@@ -49,7 +49,7 @@ async def get_unread_count(
     """
     Get count of unread notifications for the current user
     """
-    count = crud_notification.get_unread_count(db=db, company_id=company_id)
+    count = await crud_notification.get_unread_count(db=db, company_id=company_id)
     
     return DataResponse.success_response(
         data={'unread_count': count},
@@ -84,7 +84,7 @@ async def get_notification(
     """
     Get a specific notification by ID
     """
-    notification = crud_notification.get_notification(db=db, notification_id=notification_id)
+    notification = await crud_notification.get_notification(db=db, notification_id=notification_id)
     
     if not notification:
         raise HTTPException(
@@ -117,7 +117,7 @@ async def update_notification(
     Update a notification (typically to mark as read/archived)
     """
     # Check if notification exists and belongs to user
-    existing_notification = crud_notification.get_notification(db=db, notification_id=notification_id)
+    existing_notification = await crud_notification.get_notification(db=db, notification_id=notification_id)
     
     if not existing_notification:
         raise HTTPException(
@@ -131,7 +131,7 @@ async def update_notification(
             detail="Access denied"
         )
     
-    updated_notification = crud_notification.update_notification(
+    updated_notification = await crud_notification.update_notification(
         db=db,
         notification_id=notification_id,
         notification_update=notification_update
@@ -154,33 +154,23 @@ async def delete_notification(
     """
     Delete a notification
     """
-    # Check if notification exists and belongs to user
-    existing_notification = crud_notification.get_notification(db=db, notification_id=notification_id)
-    
-    if not existing_notification:
+    # Archive in one statement scoped to the company; nothing matched means it doesn't exist for this company
+    success = await crud_notification.delete_notification(
+        db=db,
+        notification_id=notification_id,
+        company_id=company_id
+    )
+
+    if not success:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Notification not found"
         )
-    
-    if str(existing_notification.company_id) != company_id:
-        raise HTTPException(
-            status_code=status.HTTP_403_FORBIDDEN,
-            detail="Access denied"
-        )
-    
-    success = crud_notification.delete_notification(db=db, notification_id=notification_id)
-    
-    if success:
-        return DataResponse.success_response(
-            data={"deleted": True},
-            message="Notification deleted successfully"
-        )
-    else:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Failed to delete notification"
-        )
+
+    return DataResponse.success_response(
+        data={"deleted": True},
+        message="Notification deleted successfully"
+    )
 
 
 @router.post("/mark-as-read/{notification_id}", response_model=DataResponse[dict])
@@ -188,12 +178,12 @@ async def mark_notifications_as_read(
     *,
     db: Session = Depends(get_db),
     company_id = Depends(get_current_company_id),
-    notification_id: str
+    notification_id: UUID4
 ) -> DataResponse[dict]:
     """
     Mark multiple notifications as read
     """
-    count = crud_notification.mark_notifications_as_read(
+    count = await crud_notification.mark_notifications_as_read(
         db=db,
         company_id=company_id,
         notification_ids=[notification_id]
@@ -213,7 +203,7 @@ async def mark_all_notifications_as_read(
     """
     Mark all notifications as read for the current user
     """
-    count = crud_notification.mark_all_notifications_as_read(
+    count = await crud_notification.mark_all_notifications_as_read(
         db=db,
         company_id=company_id
     )
@@ -235,7 +225,7 @@ async def create_notification(
     Create a new notification (for admin/system use)
     """
     notification_in.company_id = company_id
-    notification = crud_notification.create_company_notification(db=db, notification=notification_in)
+    notification = await crud_notification.create_company_notification(db=db, notification=notification_in)
     
     return DataResponse.success_response(
         data=notification,
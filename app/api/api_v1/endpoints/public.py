@@ -48,7 +48,8 @@ async def get_company_services(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Service not found"
         )
-    return DataResponse.success_response(
+    # The tree is already plain dicts in the response shape, serialise it without re-validating
+    return DataResponse.raw_success_response(
         data=services,
         message="Services fetched successfully"
     )
@@ -32,9 +32,10 @@ async def get_current_user(
         raise credentials_exception
 
     # Get user from database
-    user, company_id = await crud_user.get(db, id=user_id)
-    if user is None:
+    row = await crud_user.get(db, id=user_id)
+    if row is None:
         raise credentials_exception
+    user, company_id = row
 
     user.company_id = company_id
     return user
@@ -1,5 +1,5 @@
 from fastapi import Depends, HTTPException, status
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import Optional
 
 from app.db.session import get_db
@@ -8,12 +8,12 @@ from app.services.crud import membership as crud_membership
 from app.api.dependencies import get_current_company_id
 
 
-def get_company_membership_plan(
+async def get_company_membership_plan(
     company_id: str = Depends(get_current_company_id),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_db)
 ) -> Optional[MembershipPlanType]:
     """Get the current company's membership plan type if they have an active membership."""
-    membership = crud_membership.company_membership.get_active_membership(
+    membership = await crud_membership.company_membership.get_active_membership(
         db, company_id=company_id
     )
     if membership and membership.membership_plan:
@@ -47,9 +47,9 @@ def require_company_membership(
     
     async def membership_checker(
         company_id: str = Depends(get_current_company_id),
-        db: Session = Depends(get_db)
+        db: AsyncSession = Depends(get_db)
     ) -> MembershipPlanType:
-        membership = crud_membership.company_membership.get_active_membership(
+        membership = await crud_membership.company_membership.get_active_membership(
             db, company_id=company_id
         )
         
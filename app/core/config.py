@@ -12,6 +12,16 @@ class Settings(BaseSettings):
     POSTGRES_SERVER: str = ''
     POSTGRES_DB: str = ''
     DATABASE_URL: Optional[str] = None
+    # Per-connection caches of prepared statements (asyncpg's own and SQLAlchemy's asyncpg adapter)
+    DB_STATEMENT_CACHE_SIZE: int = 1024
+    DB_PREPARED_STATEMENT_CACHE_SIZE: int = 1024
+    # Size of SQLAlchemy's compiled SQL cache (default 500)
+    DB_QUERY_CACHE_SIZE: int = 1200
+    # Connection pool, per worker process (gunicorn runs several)
+    DB_POOL_SIZE: int = 10
+    DB_MAX_OVERFLOW: int = 20
+    DB_POOL_TIMEOUT: int = 30
+    DB_POOL_RECYCLE: int = 1800
     SECRET_KEY: Optional[str] = None
     REDIS_URL: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
@@ -0,0 +1,168 @@
+"""
+Redis backed response cache for read-heavy, frequently polled GET endpoints.
+
+Entries are keyed by method, path, query string and the caller's identity
+(user id + company id from the access token), so a response is only ever
+replayed to the user it was produced for. An entry is fresh for `ttl`
+seconds and kept for another `stale_ttl` seconds so it can be served if the
+database is unavailable. Writes that change what these endpoints return call
+invalidate_http_cache() for the affected company.
+"""
+import hashlib
+import logging
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+
+import orjson
+
+from fastapi import HTTPException
+from sqlalchemy.exc import SQLAlchemyError
+from starlette.middleware.base import BaseHTTPMiddleware
+from starlette.requests import Request
+from starlette.responses import Response
+
+from app.core.config import settings
+from app.core.redis_client import redis_client
+from app.services.auth import verify_token
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass(frozen=True)
+class CachePolicy:
+    ttl: int
+    stale_ttl: int
+    fallback: bool = True
+
+
+SHORT_CACHE = CachePolicy(ttl=5, stale_ttl=60)
+NORMAL_CACHE = CachePolicy(ttl=30, stale_ttl=300)
+LONG_CACHE = CachePolicy(ttl=60, stale_ttl=600)
+
+CACHE_POLICIES: Dict[str, CachePolicy] = {
+    f"{settings.API_V1_STR}/notifications": SHORT_CACHE,
+    f"{settings.API_V1_STR}/notifications/unread-count": SHORT_CACHE,
+    f"{settings.API_V1_STR}/notifications/all-count": SHORT_CACHE,
+    f"{settings.API_V1_STR}/memberships/plans": NORMAL_CACHE,
+    f"{settings.API_V1_STR}/memberships/active-plan": LONG_CACHE,
+}
+
+# A company's key index must outlive every entry listed in it
+_INDEX_TTL = max(policy.ttl + policy.stale_ttl for policy in CACHE_POLICIES.values())
+
+
+def _request_identity(request: Request) -> Optional[Tuple[str, Optional[str]]]:
+    """Return (user_id, company_id) from the access token, or None if the request is not authenticated"""
+    access_token = request.cookies.get("access_token")
+    if not access_token:
+        return None
+    try:
+        payload = verify_token(access_token)
+    except HTTPException:
+        return None
+    if not payload or not payload.get("sub"):
+        return None
+    return payload.get("sub"), payload.get("company_id")
+
+
+def _cache_key(request: Request, user_id: str, company_id: Optional[str]) -> str:
+    raw = f"{request.method}:{request.url.path}:{request.url.query}:{user_id}:{company_id}"
+    return f"http-cache:{hashlib.sha256(raw.encode()).hexdigest()}"
+
+
+def _company_index_key(company_id) -> str:
+    """Set of the cache keys holding responses produced for members of a company"""
+    return f"http-cache-index:{company_id}"
+
+
+async def invalidate_http_cache(company_id) -> None:
+    """Drop every cached response produced for members of a company"""
+    if company_id is None:
+        return
+    index_key = _company_index_key(company_id)
+    try:
+        keys = await redis_client.smembers(index_key)
+        await redis_client.delete(index_key, *keys)
+    except Exception as e:
+        logger.warning(f"HTTP cache unavailable: {e}")
+
+
+def _replay_headers(raw_headers: List[Tuple[bytes, bytes]], body: bytes, cache_status: str) -> List[Tuple[bytes, bytes]]:
+    """The original headers, repeated ones (Set-Cookie, Vary) included, for a replayed body"""
+    headers = [(name, value) for name, value in raw_headers if name != b"content-length"]
+    headers.append((b"content-length", str(len(body)).encode("latin-1")))
+    headers.append((b"x-cache", cache_status.encode("latin-1")))
+    return headers
+
+
+def _build_response(entry: Dict[str, str], cache_status: str) -> Response:
+    body = entry["body"].encode("utf-8")
+    response = Response(content=body, status_code=int(entry["status"]))
+    raw_headers = [(name.encode("latin-1"), value.encode("latin-1"))
+                   for name, value in orjson.loads(entry["headers"])]
+    response.raw_headers = _replay_headers(raw_headers, body, cache_status)
+    return response
+
+
+class HttpCacheMiddleware(BaseHTTPMiddleware):
+    """Serve cached GET responses for the paths listed in CACHE_POLICIES"""
+
+    async def dispatch(self, request: Request, call_next) -> Response:
+        policy = CACHE_POLICIES.get(request.url.path) if request.method == "GET" else None
+        if policy is None:
+            return await call_next(request)
+
+        identity = _request_identity(request)
+        if identity is None:
+            return await call_next(request)
+
+        user_id, company_id = identity
+        key = _cache_key(request, user_id, company_id)
+        now = time.time()
+
+        entry = None
+        try:
+            entry = await redis_client.hgetall(key)
+        except Exception as e:
+            logger.warning(f"HTTP cache unavailable: {e}")
+
+        # Entries written before headers were stored are treated as misses
+        if entry and "headers" not in entry:
+            entry = None
+
+        if entry and now < float(entry["ts"]) + policy.ttl:
+            return _build_response(entry, "HIT")
+
+        try:
+            response = await call_next(request)
+        except SQLAlchemyError:
+            if entry and policy.fallback:
+                logger.warning(f"Serving stale response for {request.url.path} after a database error")
+                return _build_response(entry, "STALE")
+            raise
+
+        if response.status_code != 200:
+            return response
+
+        body = b"".join([chunk async for chunk in response.body_iterator])
+        try:
+            # raw_headers keeps repeated headers as separate pairs, unlike a dict
+            await redis_client.hset(key, mapping={
+                "ts": now,
+                "status": response.status_code,
+                "headers": orjson.dumps([(name.decode("latin-1"), value.decode("latin-1"))
+                                         for name, value in response.raw_headers]),
+                "body": body.decode("utf-8"),
+            })
+            await redis_client.expire(key, policy.ttl + policy.stale_ttl)
+            if company_id is not None:
+                index_key = _company_index_key(company_id)
+                await redis_client.sadd(index_key, key)
+                await redis_client.expire(index_key, _INDEX_TTL)
+        except Exception as e:
+            logger.warning(f"HTTP cache unavailable: {e}")
+
+        replay = Response(content=body, status_code=response.status_code)
+        replay.raw_headers = _replay_headers(response.raw_headers, body, "MISS")
+        return replay
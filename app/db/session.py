@@ -1,14 +1,21 @@
 from sqlalchemy.ext.asyncio import create_async_engine, AsyncSession, async_sessionmaker
-from sqlalchemy.pool import NullPool
 from app.core.config import settings
 
 # Create async engine with timezone configuration
 engine = create_async_engine(
     settings.get_async_database_url(),
     echo=False,
-    poolclass=NullPool,  # Use NullPool for better async handling
+    # Pooled connections keep their asyncpg prepared statement caches between requests
+    pool_size=settings.DB_POOL_SIZE,
+    max_overflow=settings.DB_MAX_OVERFLOW,
+    pool_timeout=settings.DB_POOL_TIMEOUT,
+    pool_recycle=settings.DB_POOL_RECYCLE,
+    pool_pre_ping=True,
+    query_cache_size=settings.DB_QUERY_CACHE_SIZE,
     connect_args={
-        "server_settings": {"timezone": "utc"}
+        "server_settings": {"timezone": "utc"},
+        "statement_cache_size": settings.DB_STATEMENT_CACHE_SIZE,
+        "prepared_statement_cache_size": settings.DB_PREPARED_STATEMENT_CACHE_SIZE,
     }
 )
 
@@ -5,6 +5,8 @@ from app.core.config import settings
 from app.api.api_v1.api import api_router
 from starlette.middleware.cors import CORSMiddleware
 from app.core.redis_client import publish_event
+from app.core.http_cache import HttpCacheMiddleware
+from app.db.session import engine
 import os
 import redis.asyncio as redis
 
@@ -34,6 +36,9 @@ origins = [
     "https://test.salona.me",
 ]
 
+# Added before CORS so that CORS headers are applied to cached responses too
+app.add_middleware(HttpCacheMiddleware)
+
 app.add_middleware(
     CORSMiddleware,
     allow_origins=origins,
@@ -48,6 +53,12 @@ app.add_middleware(
 
 app.include_router(api_router, prefix=settings.API_V1_STR)
 
+
+@app.on_event("shutdown")
+async def dispose_engine():
+    # Close pooled connections when the worker stops
+    await engine.dispose()
+
 @app.exception_handler(RequestValidationError)
 async def validation_exception_handler(request: Request, exc: RequestValidationError):
     errors = exc.errors()
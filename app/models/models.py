@@ -2,7 +2,7 @@ import uuid
 
 from sqlalchemy import (Column, Integer, String, Boolean, DateTime, Text, ForeignKey, UniqueConstraint, UUID,
                         Time, Computed,
-                        CheckConstraint, LargeBinary, Index)
+                        CheckConstraint, LargeBinary, Index, DDL, event)
 from sqlalchemy.dialects.postgresql import ENUM as SQLAlchemyEnum
 from sqlalchemy.ext.hybrid import hybrid_property
 from sqlalchemy.orm import relationship
@@ -20,7 +20,8 @@ from app.models.enums import (StatusType, BookingStatus, CustomerStatusType, Ema
 class Users(BaseModel):
     __tablename__ = "users"
 
-    id = Column(UUID(as_uuid=True), primary_key=True, index=True)
+    # Generated by Postgres and read back through INSERT ... RETURNING
+    id = Column(UUID(as_uuid=True), primary_key=True, index=True, server_default=expression.text("gen_random_uuid()"))
     first_name = Column(String(100), nullable=False)
     last_name = Column(String(100), nullable=False)
     email = Column(String(255), nullable=False, unique=True)
@@ -55,7 +56,8 @@ class UserVerifications(BaseModel):
 class UserAvailabilities(BaseModel):
     __tablename__ = "user_availabilities"
 
-    id = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, index=True, unique=True)
+    # Generated by Postgres and read back through INSERT ... RETURNING
+    id = Column(UUID(as_uuid=True), primary_key=True, index=True, unique=True, server_default=expression.text("gen_random_uuid()"))
     user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"))
     day_of_week = Column(Integer, nullable=False)  # 0=Monday, 6=Sunday
     start_time = Column(Time, nullable=False)  # Store only time (HH:MM)
@@ -85,6 +87,11 @@ class UserTimeOffs(BaseModel):
 
     user = relationship("Users", back_populates="user_time_offs", lazy="selectin")
 
+    __table_args__ = (
+        # Overlap lookups filter on a user's time-offs by start_date <= x AND end_date >= y
+        Index('ix_user_time_offs_user_dates', 'user_id', 'start_date', 'end_date'),
+    )
+
 
 class Companies(BaseModel):
     __tablename__ = "companies"
@@ -245,7 +252,7 @@ class CompanyCategories(BaseModel):
     __tablename__ = "company_categories"
 
     id = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, index=True, unique=True)
-    company_id = Column(UUID, ForeignKey("companies.id", ondelete="CASCADE"))
+    company_id = Column(UUID, ForeignKey("companies.id", ondelete="CASCADE"), index=True)
     parent_category_id = Column(UUID(as_uuid=True), ForeignKey("company_categories.id", ondelete="CASCADE"), nullable=True, index=True)
     name = Column(String(100), nullable=False)
     name_en = Column(String(100), nullable=True)
@@ -289,7 +296,7 @@ class CategoryServices(BaseModel):
     __tablename__ = "category_services"
 
     id = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, index=True, unique=True)
-    category_id = Column(UUID, ForeignKey("company_categories.id", ondelete="CASCADE"))
+    category_id = Column(UUID, ForeignKey("company_categories.id", ondelete="CASCADE"), index=True)
     name = Column(String(255))
     name_en = Column(String(255), nullable=True)
     name_ee = Column(String(255), nullable=True)
@@ -313,12 +320,36 @@ class CategoryServices(BaseModel):
     service_staff = relationship("ServiceStaff", back_populates="service", lazy='selectin')
 
 
+# Services may only be added to categories without subcategories. Migration f3b9e1c4a862
+# installs this trigger on existing databases; the listeners below give tables created
+# straight from the metadata (fresh dev databases, tests on Postgres) the same check
+event.listen(CategoryServices.__table__, "after_create", DDL("""
+    CREATE OR REPLACE FUNCTION category_services_leaf_category() RETURNS trigger AS $$
+    BEGIN
+        IF EXISTS (SELECT 1 FROM company_categories WHERE parent_category_id = NEW.category_id) THEN
+            RAISE EXCEPTION 'category % has subcategories', NEW.category_id
+                USING ERRCODE = 'check_violation';
+        END IF;
+        RETURN NEW;
+    END;
+    $$ LANGUAGE plpgsql
+""").execute_if(dialect='postgresql'))
+event.listen(CategoryServices.__table__, "after_create", DDL("""
+    CREATE TRIGGER category_services_leaf_category
+    BEFORE INSERT OR UPDATE OF category_id ON category_services
+    FOR EACH ROW EXECUTE FUNCTION category_services_leaf_category()
+""").execute_if(dialect='postgresql'))
+event.listen(CategoryServices.__table__, "after_drop", DDL(
+    "DROP FUNCTION IF EXISTS category_services_leaf_category()"
+).execute_if(dialect='postgresql'))
+
+
 class ServiceStaff(BaseModel):
     __tablename__ = "service_staff"
 
     id = Column(UUID(as_uuid=True), default=uuid.uuid4, primary_key=True, index=True)
     service_id = Column(UUID, ForeignKey("category_services.id", ondelete="CASCADE"), nullable=False)
-    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    user_id = Column(UUID, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
     created_at = Column(DateTime(timezone=True), default=utcnow)
     updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
@@ -361,6 +392,11 @@ class CompanyNotifications(BaseModel):
     created_at = Column(DateTime(timezone=True), default=utcnow)
     updated_at = Column(DateTime(timezone=True), default=utcnow, onupdate=utcnow)
 
+    __table_args__ = (
+        # Serves the paginated, status-filtered notification list and the unread counters
+        Index('ix_company_notifications_company_status_created', 'company_id', 'status', created_at.desc()),
+    )
+
 
 class MembershipPlans(BaseModel):
     __tablename__ = "membership_plans"
@@ -400,7 +436,8 @@ class CompanyMemberships(BaseModel):
             'unique_active_company_membership',
             'company_id',
             unique=True,
-            postgresql_where=(expression.text("status = 'active'"))
+            postgresql_where=(expression.text("status = 'active'")),
+            postgresql_include=['end_date', 'membership_plan_id']
         ),
     )
 
@@ -441,4 +478,6 @@ class Invitations(BaseModel):
 
     company = relationship("Companies", back_populates="invitations")
 
-    __table_args__ = (UniqueConstraint('email', 'company_id', name='_email_company_uc'),)
\ No newline at end of file
+    __table_args__ = (
+        UniqueConstraint('email', 'company_id', name='_email_company_uc'),
+    )
\ No newline at end of file
@@ -1,6 +1,7 @@
 from typing import Optional, Any, Generic, TypeVar
 from pydantic import BaseModel
 from fastapi import status
+from fastapi.responses import ORJSONResponse
 
 T = TypeVar('T')
 
@@ -21,6 +22,20 @@ class DataResponse(BaseResponse, Generic[T]):
             data=data
         )
     
+    @classmethod
+    def raw_success_response(cls, data: Any = None, message: str = "Success", status_code: int = status.HTTP_200_OK) -> ORJSONResponse:
+        """
+        Same envelope as success_response, serialised straight to JSON. Returning a Response
+        skips the route's response_model validation, so only use it for data that is already
+        plain JSON-compatible dicts/lists in the documented shape.
+        """
+        return ORJSONResponse({
+            "success": True,
+            "message": message,
+            "status_code": status_code,
+            "data": data
+        })
+
     @classmethod
     def error_response(cls, message: str, status_code: int = status.HTTP_400_BAD_REQUEST, data: Optional[T] = None) -> "DataResponse[T]":
         return cls(
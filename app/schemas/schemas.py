@@ -1,6 +1,6 @@
 from datetime import datetime, date, time, timezone
 from decimal import Decimal
-from typing import Optional, List, Annotated
+from typing import Any, Optional, List, Annotated
 from pydantic import BaseModel, Field, field_validator, ConfigDict, UUID4, EmailStr
 
 from app.models import CustomerStatusType, CompanyCategories
@@ -365,14 +365,25 @@ class AvailabilityResponse(BaseModel):
     monthly: Optional[MonthlyAvailability] = None
 
 
+def _truncate_price(value: Any) -> Any:
+    """Prices are stored as whole numbers, so a fractional price is truncated toward zero like int()"""
+    if value is None or isinstance(value, int):
+        return value
+    try:
+        return int(float(value))
+    except (TypeError, ValueError, OverflowError):
+        # Left to the int validation to reject
+        return value
+
+
 class CategoryServiceBase(BaseModel):
     name: str
     name_en: Optional[str] = None
     name_ee: Optional[str] = None
     name_ru: Optional[str] = None
     duration: int
-    price: float
-    discount_price: Optional[float] = None
+    price: int
+    discount_price: Optional[int] = None
     additional_info: Optional[str] = None
     additional_info_en: Optional[str] = None
     additional_info_ee: Optional[str] = None
@@ -382,6 +393,8 @@ class CategoryServiceBase(BaseModel):
     buffer_after: Optional[int] = 0
     image_url: Optional[str] = None
 
+    _truncate_prices = field_validator("price", "discount_price", mode="before")(_truncate_price)
+
 class CategoryServiceCreate(CategoryServiceBase):
     category_id: str
     staff_ids: List[UUID4] = []  # List of staff member IDs to assign to this service
@@ -393,8 +406,8 @@ class CategoryServiceUpdate(BaseModel):
     name_ee: Optional[str] = None
     name_ru: Optional[str] = None
     duration: Optional[int] = None
-    price: Optional[float] = None
-    discount_price: Optional[float] = 0
+    price: Optional[int] = None
+    discount_price: Optional[int] = 0
     additional_info: Optional[str] = None
     additional_info_en: Optional[str] = None
     additional_info_ee: Optional[str] = None
@@ -406,6 +419,8 @@ class CategoryServiceUpdate(BaseModel):
     image_url: Optional[str] = None
     remove_image: Optional[bool] = False  # Set to True to remove the current image
 
+    _truncate_prices = field_validator("price", "discount_price", mode="before")(_truncate_price)
+
 
 class CompanyCategoryBase(BaseModel):
     name: str
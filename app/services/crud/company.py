@@ -368,12 +368,11 @@ async def create_company_member(db: AsyncSession, *, user_in: UserCreate, compan
     user_data['password'] = hash_password(user_data['password'])
 
     new_user = Users(**user_data)
-    new_user.id = str(uuid.uuid4())
     new_user.status = StatusType.active
 
+    # new_user.id is filled in from the INSERT's RETURNING clause
     db.add(new_user)
     await db.commit()
-    await db.refresh(new_user)
 
     # Add user to company
     company_user = CompanyUsers(
@@ -438,9 +437,8 @@ async def update_company_user(db: AsyncSession, *, company_id: str, user_id: str
     # Update User fields
     user_updates = {field: value for field, value in update_data.items() if field in user_fields}
     if user_updates:
-        stmt = select(Users).filter(Users.id == user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        # Already loaded with company_user above, so this is an identity map hit
+        user = await db.get(Users, company_user.user_id)
 
         if user:
             for field, value in user_updates.items():
@@ -467,7 +465,6 @@ async def update_company_user(db: AsyncSession, *, company_id: str, user_id: str
         db_availabilities = []
         for availability_in in availabilities:
             db_availability = UserAvailabilities(
-                id=str(uuid.uuid4()),
                 user_id=user_id,
                 day_of_week=availability_in.day_of_week,
                 start_time=availability_in.start_time,
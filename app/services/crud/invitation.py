@@ -1,23 +1,89 @@
+import json
 import uuid
 from typing import Optional, List
-from datetime import datetime, timedelta, timezone
+from datetime import datetime, timedelta
 from pydantic import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from sqlalchemy.exc import SQLAlchemyError
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, func, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.orm import selectinload, make_transient_to_detached
 from app.models.models import Invitations, CompanyUsers
 from app.schemas.schemas import Invitation
 from app.models.enums import InvitationStatus, StatusType, CompanyRoleType
-from app.core.datetime_utils import utcnow
+from app.core.datetime_utils import utcnow, ensure_utc
+from app.core.http_cache import invalidate_http_cache
+from app.core.redis_client import redis_client
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Invitations can be accepted for this long after they were (re)sent
+INVITATION_EXPIRY = timedelta(days=3)
 
-def create_invitation(
-    db: Session,
+# Invitation links are usually opened several times in a row (landing page,
+# then accept), so token lookups are cached briefly in Redis
+INVITATION_CACHE_TTL_SECONDS = 60
+
+
+def _invitation_cache_key(token: str) -> str:
+    return f"invite:{token}"
+
+
+async def _get_cached_invitation(token: str) -> Optional[Invitations]:
+    """Rebuild a pending invitation from Redis, or None on a miss"""
+    try:
+        blob = await redis_client.get(_invitation_cache_key(token))
+    except Exception as e:
+        logger.warning(f"Invitation cache unavailable: {e}")
+        return None
+    if not blob:
+        return None
+
+    data = json.loads(blob)
+    invitation = Invitations(
+        id=uuid.UUID(data["id"]),
+        email=data["email"],
+        token=data["token"],
+        role=CompanyRoleType(data["role"]),
+        status=InvitationStatus(data["status"]),
+        company_id=uuid.UUID(data["company_id"]),
+        created_at=datetime.fromisoformat(data["created_at"]),
+        updated_at=datetime.fromisoformat(data["updated_at"])
+    )
+    # Mark it as an existing row so that callers can db.add() it and get an UPDATE
+    make_transient_to_detached(invitation)
+    return invitation
+
+
+async def _cache_invitation(invitation: Invitations) -> None:
+    blob = json.dumps({
+        "id": str(invitation.id),
+        "email": invitation.email,
+        "token": invitation.token,
+        "role": invitation.role.value,
+        "status": invitation.status.value,
+        "company_id": str(invitation.company_id),
+        "created_at": invitation.created_at.isoformat(),
+        "updated_at": invitation.updated_at.isoformat()
+    })
+    try:
+        await redis_client.setex(_invitation_cache_key(invitation.token), INVITATION_CACHE_TTL_SECONDS, blob)
+    except Exception as e:
+        logger.warning(f"Invitation cache unavailable: {e}")
+
+
+async def invalidate_cached_invitation(token: str) -> None:
+    """Drop a token from the invitation cache after its invitation changed"""
+    try:
+        await redis_client.delete(_invitation_cache_key(token))
+    except Exception as e:
+        logger.warning(f"Invitation cache unavailable: {e}")
+
+
+async def create_invitation(
+    db: AsyncSession,
     company_id: str,
     email: str,
     role: CompanyRoleType = CompanyRoleType.staff,
@@ -41,26 +107,29 @@ def create_invitation(
             token = str(uuid.uuid4())
 
         # Check if an active invitation already exists for this email and company
-        existing = db.query(Invitations).filter(
+        stmt = select(Invitations).filter(
             Invitations.email == email,
             Invitations.company_id == company_id,
             Invitations.status == InvitationStatus.PENDING
-        ).first()
+        )
+        result = await db.execute(stmt)
+        existing = result.scalar_one_or_none()
 
         if existing:
             # Update the existing invitation
+            old_token = existing.token
             existing.token = token
             existing.role = role
             existing.updated_at = utcnow()
             db.add(existing)
-            db.commit()
-            db.refresh(existing)
+            await db.commit()
+            await invalidate_cached_invitation(old_token)
 
             return Invitation.model_validate(existing)
 
         # Create new invitation
         invitation = Invitations(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4(),
             email=email,
             token=token,
             role=role,
@@ -69,21 +138,20 @@ def create_invitation(
         )
         
         db.add(invitation)
-        db.commit()
-        db.refresh(invitation)
+        await db.commit()
         return Invitation.model_validate(invitation)
 
     except SQLAlchemyError as e:
         logger.error(f"Database error creating invitation: {e}")
-        db.rollback()
+        await db.rollback()
         raise
     except Exception as e:
         logger.error(f"Unexpected error creating invitation: {e}")
-        db.rollback()
+        await db.rollback()
         raise
 
 
-def get_invitation_by_token(db: Session, token: str) -> Optional[Invitations]:
+async def get_invitation_by_token(db: AsyncSession, token: str) -> Optional[Invitations]:
     """
     Get an invitation by token.
 
@@ -95,21 +163,31 @@ def get_invitation_by_token(db: Session, token: str) -> Optional[Invitations]:
         Invitations: The invitation record or None if not found
     """
     try:
-        invitation = db.query(Invitations).filter(
+        cached = await _get_cached_invitation(token)
+        if cached and utcnow() < ensure_utc(cached.created_at) + INVITATION_EXPIRY:
+            return cached
+
+        # Let the database evaluate the expiry against its own clock
+        is_expired = (Invitations.created_at <= func.now() - INVITATION_EXPIRY).label("is_expired")
+        stmt = select(Invitations, is_expired).filter(
             Invitations.token == token,
             Invitations.status == InvitationStatus.PENDING
-        ).first()
+        )
+        result = await db.execute(stmt)
+        row = result.first()
 
-        # Check if invitation has expired (older than 3 days)
-        if invitation:
-            expires_at = invitation.created_at + timedelta(days=3)
-            if datetime.now(timezone.utc) > expires_at:
-                invitation.status = InvitationStatus.EXPIRED
-                db.add(invitation)
-                db.commit()
-                db.refresh(invitation)
-                return None
+        if not row:
+            return None
+
+        invitation, expired = row
+        if expired:
+            invitation.status = InvitationStatus.EXPIRED
+            db.add(invitation)
+            await db.commit()
+            await invalidate_cached_invitation(token)
+            return None
 
+        await _cache_invitation(invitation)
         return invitation
     except SQLAlchemyError as e:
         logger.error(f"Database error while fetching invitation: {str(e)}")
@@ -174,8 +252,8 @@ async def get_company_invitations(
         raise
 
 
-def accept_invitation(
-    db: Session,
+async def accept_invitation(
+    db: AsyncSession,
     invitation: Invitations,
     user_id: UUID4
 ) -> bool:
@@ -191,46 +269,41 @@ def accept_invitation(
         bool: True if successful
     """
     try:
-        # Update invitation status
-        invitation.status = InvitationStatus.USED
-        invitation.updated_at = utcnow()
-        db.add(invitation)
+        now = utcnow()
+
+        # Add user to company, or re-activate them with the invited role if already a member
+        stmt = (pg_insert(CompanyUsers)
+                .values(user_id=user_id,
+                        company_id=invitation.company_id,
+                        role=invitation.role,
+                        status=StatusType.active)
+                .on_conflict_do_update(
+                    constraint='_user_company_uc',
+                    set_={'role': invitation.role, 'status': StatusType.active, 'updated_at': now}
+                ))
+        await db.execute(stmt)
 
-        # Check if user is already a company member
-        existing_member = db.query(CompanyUsers).filter(
-            CompanyUsers.user_id == user_id,
-            CompanyUsers.company_id == invitation.company_id
-        ).first()
-
-        if not existing_member:
-            # Add user to company
-            company_user = CompanyUsers(
-                id=uuid.uuid4(),
-                user_id=user_id,
-                company_id=invitation.company_id,
-                role=invitation.role,
-                status=StatusType.active
-            )
-            db.add(company_user)
-        else:
-            # If already a member, update their role and status
-            existing_member.role = invitation.role
-            existing_member.status = StatusType.active
-            db.add(existing_member)
-
-        db.commit()
+        # Update invitation status
+        stmt = (update(Invitations)
+                .where(Invitations.id == invitation.id)
+                .values(status=InvitationStatus.USED, updated_at=now))
+        await db.execute(stmt)
+
+        await db.commit()
+        await invalidate_cached_invitation(invitation.token)
+        await invalidate_http_cache(invitation.company_id)
         return True
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error while accepting invitation: {str(e)}")
         raise
     except Exception as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Unexpected error while accepting invitation: {str(e)}")
         raise
 
 
-def decline_invitation(db: Session, token: str) -> bool:
+async def decline_invitation(db: AsyncSession, token: str) -> bool:
     """
     Decline an invitation.
 
@@ -242,9 +315,9 @@ def decline_invitation(db: Session, token: str) -> bool:
         bool: True if successful
     """
     try:
-        invitation = db.query(Invitations).filter(
-            Invitations.token == token
-        ).first()
+        stmt = select(Invitations).filter(Invitations.token == token)
+        result = await db.execute(stmt)
+        invitation = result.scalar_one_or_none()
 
         if not invitation:
             return False
@@ -252,16 +325,17 @@ def decline_invitation(db: Session, token: str) -> bool:
         invitation.status = InvitationStatus.DECLINED
         invitation.updated_at = utcnow()
         db.add(invitation)
-        db.commit()
+        await db.commit()
+        await invalidate_cached_invitation(token)
         return True
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error while declining invitation: {str(e)}")
         raise
 
 
-def resend_invitation(
-    db: Session,
+async def resend_invitation(
+    db: AsyncSession,
     company_id: UUID4,
     email: str
 ) -> Optional[Invitations]:
@@ -277,26 +351,29 @@ def resend_invitation(
         Invitations: The updated invitation record or None if not found
     """
     try:
-        invitation = db.query(Invitations).filter(
+        stmt = select(Invitations).filter(
             Invitations.email == email,
             Invitations.company_id == company_id,
             Invitations.status.in_([InvitationStatus.PENDING, InvitationStatus.EXPIRED])
-        ).first()
+        )
+        result = await db.execute(stmt)
+        invitation = result.scalar_one_or_none()
 
         if not invitation:
             return None
 
         # Generate new token and reset to pending
+        old_token = invitation.token
         invitation.token = str(uuid.uuid4())
         invitation.status = InvitationStatus.PENDING
         invitation.created_at = utcnow()
         invitation.updated_at = utcnow()
 
         db.add(invitation)
-        db.commit()
-        db.refresh(invitation)
+        await db.commit()
+        await invalidate_cached_invitation(old_token)
         return invitation
     except SQLAlchemyError as e:
-        db.rollback()
+        await db.rollback()
         logger.error(f"Database error while resending invitation: {str(e)}")
         raise
@@ -1,7 +1,7 @@
-from datetime import datetime, timedelta, timezone
+import uuid
 from typing import Optional, List
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, and_, or_
+from sqlalchemy import select, insert, literal, func, update, and_, or_
 from sqlalchemy.orm import selectinload
 
 from app.models.models import MembershipPlans, CompanyMemberships
@@ -11,6 +11,7 @@ from app.schemas.membership import (
     CompanyMembershipCreate, CompanyMembershipUpdate
 )
 from app.core.datetime_utils import utcnow, ensure_utc
+from app.core.http_cache import invalidate_http_cache
 
 
 class MembershipPlanCRUD:
@@ -59,7 +60,6 @@ class MembershipPlanCRUD:
 
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return db_obj
 
     async def delete(self, db: AsyncSession, *, id: str) -> Optional[MembershipPlans]:
@@ -73,7 +73,6 @@ class MembershipPlanCRUD:
             db_obj.updated_at = utcnow()
             db.add(db_obj)
             await db.commit()
-            await db.refresh(db_obj)
         return db_obj
 
 
@@ -82,41 +81,47 @@ class CompanyMembershipCRUD:
 
     async def create(self, db: AsyncSession, *, company_id: str, obj_in: CompanyMembershipCreate) -> CompanyMemberships:
         """Create a new company membership subscription"""
-        # Get the membership plan to calculate end date
-        stmt = select(MembershipPlans).filter(MembershipPlans.id == obj_in.membership_plan_id)
-        result = await db.execute(stmt)
-        plan = result.scalar_one_or_none()
-
-        if not plan:
-            raise ValueError("Membership plan not found")
-
         # Deactivate any existing active memberships
-        stmt = select(CompanyMemberships).filter(
-            CompanyMemberships.company_id == company_id,
-            CompanyMemberships.status == StatusType.active
+        stmt = (update(CompanyMemberships)
+                .where(CompanyMemberships.company_id == company_id,
+                       CompanyMemberships.status == StatusType.active)
+                .values(status=StatusType.inactive))
+        await db.execute(stmt)
+
+        # Insert straight from the plan row so the end date is computed in SQL
+        # (now() + duration_days) and the plan lookup shares the INSERT round-trip
+        now = func.now()
+        plan_rows = (
+            select(
+                literal(uuid.uuid4(), CompanyMemberships.id.type),
+                literal(company_id, CompanyMemberships.company_id.type),
+                MembershipPlans.id,
+                literal(StatusType.active, CompanyMemberships.status.type),
+                now,
+                now + func.make_interval(0, 0, 0, MembershipPlans.duration_days),
+                literal(obj_in.auto_renew),
+                now,
+                now,
+            )
+            .where(MembershipPlans.id == obj_in.membership_plan_id)
         )
-        result = await db.execute(stmt)
-        existing = result.scalars().all()
-
-        for membership in existing:
-            membership.status = StatusType.inactive
-            db.add(membership)
-
-        # Calculate end date
-        start_date = utcnow()
-        end_date = start_date + timedelta(days=int(str(plan.duration_days)))
-
-        db_obj = CompanyMemberships(
-            company_id=company_id,
-            membership_plan_id=obj_in.membership_plan_id,
-            auto_renew=obj_in.auto_renew,
-            start_date=start_date,
-            end_date=end_date,
-            status=StatusType.active
+        stmt = (
+            insert(CompanyMemberships)
+            .from_select(
+                ['id', 'company_id', 'membership_plan_id', 'status', 'start_date',
+                 'end_date', 'auto_renew', 'created_at', 'updated_at'],
+                plan_rows,
+            )
+            .returning(CompanyMemberships)
         )
-        db.add(db_obj)
+        db_obj = await db.scalar(stmt)
+
+        if not db_obj:
+            await db.rollback()
+            raise ValueError("Membership plan not found")
+
         await db.commit()
-        await db.refresh(db_obj)
+        await invalidate_http_cache(company_id)
         return db_obj
 
     async def get(self, db: AsyncSession, *, id: str) -> Optional[CompanyMemberships]:
@@ -127,15 +132,12 @@ class CompanyMembershipCRUD:
 
     async def get_active_membership(self, db: AsyncSession, *, company_id: str) -> Optional[CompanyMemberships]:
         """Get company's active membership"""
-        # Use naive datetime since DB expects TIMESTAMP WITHOUT TIME ZONE
-        now_naive = datetime.now(timezone.utc).replace(tzinfo=None)
-
         stmt = (select(CompanyMemberships)
             .options(selectinload(CompanyMemberships.membership_plan))
             .filter(
                 CompanyMemberships.company_id == company_id,
                 CompanyMemberships.status == StatusType.active,
-                CompanyMemberships.end_date > now_naive
+                CompanyMemberships.end_date > func.now()
         ))
         result = await db.execute(stmt)
         return result.scalar_one_or_none()
@@ -166,7 +168,7 @@ class CompanyMembershipCRUD:
 
         db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
+        await invalidate_http_cache(db_obj.company_id)
         return db_obj
 
     async def cancel(self, db: AsyncSession, *, id: str) -> Optional[CompanyMemberships]:
@@ -180,7 +182,7 @@ class CompanyMembershipCRUD:
             obj.auto_renew = False
             db.add(obj)
             await db.commit()
-            await db.refresh(obj)
+            await invalidate_http_cache(obj.company_id)
         return obj
 
 
@@ -1,20 +1,111 @@
+import logging
+import uuid
 from typing import List, Optional
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import and_, func, select, update
+from sqlalchemy import and_, any_, bindparam, func, select, update, UUID
+from sqlalchemy.dialects.postgresql import ARRAY
 from pydantic import UUID4
 
 from app.models import NotificationStatus
 from app.models.models import CompanyNotifications
 from app.schemas import NotificationCreate, NotificationUpdate, Notification
 from app.schemas.responses import PaginationInfo
+from app.core.http_cache import invalidate_http_cache
+from app.core.redis_client import redis_client
+
+logger = logging.getLogger(__name__)
+
+# Badge counts are read on almost every page render, so they are cached in
+# Redis and adjusted in place by the writes below
+NOTIFICATION_COUNT_TTL_SECONDS = 60
+
+# Adjust a cached counter only while it exists, so a missing key is never
+# recreated from a partial delta
+_INCRBY_IF_EXISTS = """
+if redis.call('EXISTS', KEYS[1]) == 1 then
+    return redis.call('INCRBY', KEYS[1], ARGV[1])
+end
+return nil
+"""
+
+
+# The id list is bound as a single uuid[] parameter so the statement (and the
+# prepared statement on the driver side) is the same regardless of list length
+_mark_as_read_stmt = (
+    update(CompanyNotifications)
+    .where(
+        CompanyNotifications.company_id == bindparam('cid'),
+        CompanyNotifications.id == any_(bindparam('ids', type_=ARRAY(UUID(as_uuid=True)))),
+        CompanyNotifications.status == NotificationStatus.UNREAD
+    )
+    .values(status=NotificationStatus.READ)
+    .execution_options(synchronize_session=False)
+)
+
+_mark_all_as_read_stmt = (
+    update(CompanyNotifications)
+    .where(
+        CompanyNotifications.company_id == bindparam('cid'),
+        CompanyNotifications.status == NotificationStatus.UNREAD
+    )
+    .values(status=NotificationStatus.READ)
+    .execution_options(synchronize_session=False)
+)
+
+
+def _unread_count_key(company_id) -> str:
+    return f"notif:unread:{company_id}"
+
+
+def _all_count_key(company_id) -> str:
+    return f"notif:all:{company_id}"
+
+
+async def _get_cached_count(key: str) -> Optional[int]:
+    try:
+        value = await redis_client.get(key)
+    except Exception as e:
+        logger.warning(f"Notification count cache unavailable: {e}")
+        return None
+    return int(value) if value is not None else None
+
+
+async def _cache_count(key: str, count: int) -> None:
+    try:
+        await redis_client.setex(key, NOTIFICATION_COUNT_TTL_SECONDS, count)
+    except Exception as e:
+        logger.warning(f"Notification count cache unavailable: {e}")
+
+
+async def _adjust_cached_count(key: str, delta: int) -> None:
+    if not delta:
+        return
+    try:
+        await redis_client.eval(_INCRBY_IF_EXISTS, 1, key, delta)
+    except Exception as e:
+        logger.warning(f"Notification count cache unavailable: {e}")
+
+
+async def invalidate_cached_counts(company_id) -> None:
+    """Drop a company's cached notification counts"""
+    try:
+        await redis_client.delete(_unread_count_key(company_id), _all_count_key(company_id))
+    except Exception as e:
+        logger.warning(f"Notification count cache unavailable: {e}")
 
 
 async def create_company_notification(db: AsyncSession, notification: NotificationCreate) -> Notification:
     """Create a new notification"""
     db_notification = CompanyNotifications(**notification.model_dump())
     db.add(db_notification)
+    # id, status and timestamps are Python-side defaults and sessions don't expire on
+    # commit, so the instance is complete without a refresh
     await db.commit()
-    await db.refresh(db_notification)
+
+    await _adjust_cached_count(_all_count_key(db_notification.company_id), 1)
+    if db_notification.status == NotificationStatus.UNREAD:
+        await _adjust_cached_count(_unread_count_key(db_notification.company_id), 1)
+    await invalidate_http_cache(db_notification.company_id)
     return db_notification
 
 
@@ -36,31 +127,33 @@ async def get_user_notifications(
     if status_filter is None:
         status_filter = ['unread', 'read']
 
-    stmt = select(CompanyNotifications).filter(CompanyNotifications.company_id == company_id)
+    filters = [CompanyNotifications.company_id == company_id]
 
     # Apply status filter if provided
     if status_filter:
-        stmt = stmt.filter(CompanyNotifications.status.in_(status_filter))
-
-    # Order by created_at descending (newest first)
-    stmt = stmt.order_by(CompanyNotifications.created_at.desc())
-
-    # Calculate total count
-    count_stmt = select(func.count()).select_from(CompanyNotifications).filter(
-        CompanyNotifications.company_id == company_id
-    )
-    if status_filter:
-        count_stmt = count_stmt.filter(CompanyNotifications.status.in_(status_filter))
-
-    count_result = await db.execute(count_stmt)
-    total = count_result.scalar()
+        filters.append(CompanyNotifications.status.in_(status_filter))
 
-    # Calculate pagination
+    # Fetch the page together with the total count of matching rows (window count)
     offset = (page - 1) * per_page
-    stmt = stmt.offset(offset).limit(per_page)
-
+    stmt = (
+        select(CompanyNotifications, func.count().over().label('total'))
+        .filter(*filters)
+        .order_by(CompanyNotifications.created_at.desc())
+        .offset(offset)
+        .limit(per_page)
+    )
     result = await db.execute(stmt)
-    notifications = result.scalars().all()
+    rows = result.all()
+    notifications = [row[0] for row in rows]
+
+    if rows:
+        total = rows[0].total
+    elif offset == 0:
+        total = 0
+    else:
+        # Page is past the end, so no row carried the total
+        count_stmt = select(func.count()).select_from(CompanyNotifications).filter(*filters)
+        total = (await db.execute(count_stmt)).scalar()
 
     total_pages = (total + per_page - 1) // per_page
     
@@ -89,64 +182,61 @@ async def update_notification(
         for key, value in update_data.items():
             setattr(db_notification, key, value)
         await db.commit()
-        await db.refresh(db_notification)
+        await invalidate_cached_counts(db_notification.company_id)
+        await invalidate_http_cache(db_notification.company_id)
     return db_notification
 
 
-async def delete_notification(db: AsyncSession, notification_id: UUID4) -> bool:
-    """Delete a notification"""
+async def delete_notification(db: AsyncSession, notification_id: UUID4, company_id: Optional[UUID4] = None) -> bool:
+    """
+    Delete (archive) a notification.
+    If company_id is given, only a notification of that company is matched.
+    Returns False when no notification matched.
+    """
     stmt = (
         update(CompanyNotifications)
         .where(CompanyNotifications.id == notification_id)
         .values(status=NotificationStatus.ARCHIVED)
+        .returning(CompanyNotifications.company_id)
     )
-    await db.execute(stmt)
+    if company_id is not None:
+        stmt = stmt.where(CompanyNotifications.company_id == company_id)
+
+    archived_company_id = await db.scalar(stmt)
     await db.commit()
+    if archived_company_id is None:
+        return False
+
+    await invalidate_cached_counts(archived_company_id)
+    await invalidate_http_cache(archived_company_id)
     return True
 
 
-async def mark_notifications_as_read(db: AsyncSession, company_id: UUID4, notification_ids: List[str]) -> int:
+async def mark_notifications_as_read(db: AsyncSession, company_id: UUID4, notification_ids: List[UUID4]) -> int:
     """Mark multiple notifications as read"""
-    stmt = (
-        update(CompanyNotifications)
-        .where(
-            and_(
-                CompanyNotifications.company_id == company_id,
-                CompanyNotifications.id.in_(notification_ids)
-            )
-        )
-        .values(status=NotificationStatus.READ)
-    )
-
-    result = await db.execute(stmt)
+    ids = [n_id if isinstance(n_id, uuid.UUID) else uuid.UUID(str(n_id)) for n_id in notification_ids]
+    result = await db.execute(_mark_as_read_stmt, {'cid': company_id, 'ids': ids})
     await db.commit()
+    await _adjust_cached_count(_unread_count_key(company_id), -result.rowcount)
+    await invalidate_http_cache(company_id)
     return result.rowcount
 
 
 async def mark_all_notifications_as_read(db: AsyncSession, company_id: UUID4) -> int:
     """Mark all notifications as read for a user"""
-    from app.models.enums import NotificationStatus
-    
-    stmt = (
-        update(CompanyNotifications)
-        .where(
-            and_(
-                CompanyNotifications.company_id == company_id,
-                CompanyNotifications.status == NotificationStatus.UNREAD
-            )
-        )
-        .values(status=NotificationStatus.READ)
-    )
-
-    result = await db.execute(stmt)
+    result = await db.execute(_mark_all_as_read_stmt, {'cid': company_id})
     await db.commit()
+    await _cache_count(_unread_count_key(company_id), 0)
+    await invalidate_http_cache(company_id)
     return result.rowcount
 
 
 async def get_unread_count(db: AsyncSession, company_id: UUID4) -> int:
     """Get count of unread notifications for a user"""
-    from app.models.enums import NotificationStatus
-    
+    cached = await _get_cached_count(_unread_count_key(company_id))
+    if cached is not None:
+        return cached
+
     stmt = select(func.count(CompanyNotifications.id)).filter(
         and_(
             CompanyNotifications.company_id == company_id,
@@ -154,14 +244,21 @@ async def get_unread_count(db: AsyncSession, company_id: UUID4) -> int:
         )
     )
     result = await db.execute(stmt)
-    return result.scalar()
+    count = result.scalar()
+    await _cache_count(_unread_count_key(company_id), count)
+    return count
 
 
 async def get_all_count(db: AsyncSession, company_id: UUID4) -> int:
     """Get count of all notifications for a company"""
+    cached = await _get_cached_count(_all_count_key(company_id))
+    if cached is not None:
+        return cached
+
     stmt = select(func.count(CompanyNotifications.id)).filter(
         CompanyNotifications.company_id == company_id
     )
     result = await db.execute(stmt)
-    return result.scalar()
-
+    count = result.scalar()
+    await _cache_count(_all_count_key(company_id), count)
+    return count
@@ -1,15 +1,176 @@
+import asyncio
+import logging
+import uuid
 from typing import Optional, Dict, List
 from collections import defaultdict
+import orjson
 from pydantic.v1 import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, delete
-from sqlalchemy.orm import selectinload
-
-from app.models.models import CategoryServices, CompanyCategories, ServiceStaff, Users
-from app.schemas import CategoryServiceResponse, CompanyCategoryCreate, CompanyCategoryUpdate, CategoryServiceCreate, \
-    CategoryServiceUpdate, StaffMember
-from app.schemas.schemas import CompanyCategoryWithServicesResponse
-
+from sqlalchemy import select, insert, update, literal, literal_column, exists, bindparam, func, delete, null
+from sqlalchemy.dialects.postgresql import JSONB, insert as pg_insert
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import selectinload, raiseload, lazyload, load_only
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.redis_client import redis_client
+from app.models.models import CategoryServices, CompanyCategories, ServiceStaff, Users, BookingServices
+from app.schemas import CompanyCategoryCreate, CompanyCategoryUpdate, CategoryServiceCreate, CategoryServiceUpdate
+
+logger = logging.getLogger(__name__)
+
+
+# Services may only be placed in leaf categories. The database enforces this with the
+# category_services_leaf_category trigger (check_violation); a missing category fails the
+# foreign key instead. Both are reported with the messages below.
+_FOREIGN_KEY_VIOLATION = '23503'
+_CHECK_VIOLATION = '23514'
+CATEGORY_NOT_FOUND_MESSAGE = "Category not found"
+CATEGORY_HAS_SUBCATEGORIES_MESSAGE = ("Cannot add services to a category that has subcategories. "
+                                      "Please add services to the subcategories instead.")
+
+# The company services and categories trees are read on every menu or booking page render
+# and rarely change, so their serialised form is cached in Redis (shared by all workers) and
+# dropped by the writes below. Changes made elsewhere, such as a staff member renaming
+# themselves, show up within the TTL.
+COMPANY_CATALOG_TTL_SECONDS = 60
+
+
+# Staff users are only rendered through the nested User schema, so load just those columns
+# and none of the user's own (selectin by default) relationships such as booked services
+_STAFF_USER_OPTIONS = (
+    load_only(Users.id, Users.first_name, Users.last_name, Users.email, Users.phone, Users.status,
+              Users.languages, Users.position, Users.profile_photo_url, Users.created_at, Users.updated_at),
+    lazyload('*'),
+)
+
+def _jsonb_object(*columns, **values):
+    """jsonb_build_object() over the given columns keyed by column name, plus extra named values"""
+    args = []
+    for key, value in [(column.key, column) for column in columns] + list(values.items()):
+        # Keys are inlined: asyncpg cannot infer a type for parameters of the variadic function
+        args += [literal_column(f"'{key}'"), value]
+    return func.jsonb_build_object(*args)
+
+
+def _jsonb_array(statement):
+    """Aggregate a one-column select into a JSON array, an empty one when there are no rows"""
+    aggregated = statement.with_only_columns(
+        func.coalesce(func.jsonb_agg(statement.selected_columns[0]), literal_column("'[]'::jsonb"), type_=JSONB)
+    )
+    return aggregated.scalar_subquery()
+
+
+# Columns rendered by get_company_categories_hierarchical
+_CATEGORY_COLUMNS = (
+    CompanyCategories.id, CompanyCategories.company_id, CompanyCategories.parent_category_id,
+    CompanyCategories.name, CompanyCategories.name_en, CompanyCategories.name_ee, CompanyCategories.name_ru,
+    CompanyCategories.description, CompanyCategories.description_en, CompanyCategories.description_ee,
+    CompanyCategories.description_ru, CompanyCategories.created_at, CompanyCategories.updated_at,
+)
+
+# Services of a category as JSON, each with its assigned staff and their user, built by
+# Postgres so the tree comes back as one row per category instead of one per staff member
+_service_staff_json = _jsonb_array(
+    select(_jsonb_object(
+        ServiceStaff.id, ServiceStaff.service_id, ServiceStaff.user_id, ServiceStaff.created_at,
+        ServiceStaff.updated_at,
+        user=_jsonb_object(
+            Users.id, Users.first_name, Users.last_name, Users.email, Users.phone, Users.status, Users.languages,
+            Users.position, Users.profile_photo_url, Users.created_at, Users.updated_at,
+            company_id=null(),  # Part of the User schema, not set for staff listings
+        ),
+    ))
+    .join(Users, Users.id == ServiceStaff.user_id)
+    .where(ServiceStaff.service_id == CategoryServices.id)
+)
+_category_services_json = _jsonb_array(
+    select(_jsonb_object(
+        CategoryServices.id, CategoryServices.name, CategoryServices.name_en, CategoryServices.name_ee,
+        CategoryServices.name_ru, CategoryServices.duration, CategoryServices.price, CategoryServices.discount_price,
+        CategoryServices.status, CategoryServices.additional_info, CategoryServices.additional_info_en,
+        CategoryServices.additional_info_ee, CategoryServices.additional_info_ru, CategoryServices.buffer_before,
+        CategoryServices.buffer_after, CategoryServices.image_url,
+        service_staff=_service_staff_json,
+    ))
+    .where(CategoryServices.category_id == CompanyCategories.id)
+)
+
+# In-flight get_company_services fetches by company id. The result is made of plain
+# dicts, not ORM instances, so it can be handed to callers with other sessions.
+_inflight_company_services: Dict[str, asyncio.Future] = {}
+
+
+def _company_services_key(company_id) -> str:
+    return f"company_services:{company_id}"
+
+
+def _company_categories_key(company_id) -> str:
+    return f"company_categories:{company_id}"
+
+
+async def invalidate_company_catalog(company_id) -> None:
+    """Drop a company's cached services and categories trees"""
+    if company_id is None:
+        return
+    try:
+        await redis_client.delete(_company_services_key(company_id), _company_categories_key(company_id))
+    except Exception as e:
+        logger.warning(f"Company catalog cache unavailable: {e}")
+
+
+async def _invalidate_category_company_catalog(db: AsyncSession, category_id) -> None:
+    """Drop the cached trees of the company owning a category"""
+    stmt = select(CompanyCategories.company_id).where(CompanyCategories.id == category_id)
+    await invalidate_company_catalog(await db.scalar(stmt))
+
+
+async def _invalidate_service_company_catalog(db: AsyncSession, service_id) -> None:
+    """Drop the cached trees of the company owning a service"""
+    stmt = (select(CompanyCategories.company_id)
+            .join(CategoryServices, CategoryServices.category_id == CompanyCategories.id)
+            .where(CategoryServices.id == service_id))
+    await invalidate_company_catalog(await db.scalar(stmt))
+
+
+def _raise_for_category_violation(error: IntegrityError) -> None:
+    """Re-raise a rejected service category as ValueError, any other integrity error as is"""
+    sqlstate = getattr(error.orig, 'pgcode', None)
+    if sqlstate == _FOREIGN_KEY_VIOLATION:
+        raise ValueError(CATEGORY_NOT_FOUND_MESSAGE) from error
+    if sqlstate == _CHECK_VIOLATION:
+        raise ValueError(CATEGORY_HAS_SUBCATEGORIES_MESSAGE) from error
+    raise error
+
+
+# Statements for the hot readers are built once at import; each call only binds parameters
+
+# A company's service, with assigned staff and category
+_get_service_stmt = (
+    select(CategoryServices)
+    .options(selectinload(CategoryServices.service_staff)
+             .selectinload(ServiceStaff.user).options(*_STAFF_USER_OPTIONS))
+    .options(selectinload(CategoryServices.company_category))
+    # Relationships not loaded above raise on access in every environment, rather than
+    # turning into an implicit lazy load (MissingGreenlet under asyncio)
+    .options(raiseload('*'))
+    .join(CompanyCategories, CategoryServices.category_id == CompanyCategories.id)
+    .filter(CompanyCategories.company_id == bindparam('company_id'),
+            CategoryServices.id == bindparam('service_id'))
+)
+
+# All categories of a company, each with its services and their staff as a JSON array
+_company_services_stmt = (
+    select(CompanyCategories.id, CompanyCategories.name, CompanyCategories.description,
+           CompanyCategories.parent_category_id, _category_services_json.label('services'))
+    .filter(CompanyCategories.company_id == bindparam('company_id'))
+)
+
+_service_staff_stmt = (
+    select(ServiceStaff)
+    .options(selectinload(ServiceStaff.user).options(*_STAFF_USER_OPTIONS))
+    .options(selectinload(ServiceStaff.service))
+    .filter(ServiceStaff.service_id == bindparam('service_id'))
+)
 
 
 #
@@ -38,106 +199,98 @@ async def get_service(db: AsyncSession, service_id: str, company_id: str) -> Opt
     Get all services for a company grouped by category
     Returns a dictionary where keys are categories and values are lists of services
     """
-    stmt = (select(CategoryServices)
-            .options(selectinload(CategoryServices.service_staff))
-            .options(selectinload(CategoryServices.company_category))
-            .join(CompanyCategories, CategoryServices.category_id == CompanyCategories.id)
-            .filter(CompanyCategories.company_id == company_id, CategoryServices.id == service_id))
-
-    result = await db.execute(stmt)
+    result = await db.execute(_get_service_stmt, {'company_id': company_id, 'service_id': service_id})
     service = result.scalar_one_or_none()
 
     return service
 
 
-async def get_company_services(db: AsyncSession, company_id: str) -> List[CompanyCategoryWithServicesResponse]:
+async def get_company_services(db: AsyncSession, company_id: str) -> List[dict]:
     """
     Get all services for a company grouped by category with assigned staff in hierarchical structure
     Returns categories with their services and subcategories
-    """
-    # Get all categories and services for the company
-    stmt = (select(CompanyCategories)
-            .options(selectinload(CompanyCategories.category_service))
-            .filter(CompanyCategories.company_id == company_id))
-    result = await db.execute(stmt)
-    all_categories = result.scalars().all()
-
-    # Build a dictionary for quick lookup
-    category_dict = {}
-    for cat in all_categories:
-        category_dict[str(cat.id)] = {
-            'category': cat,
-            'services': [],
-            'subcategories': []
-        }
-
-    # Get all services for the company
-    stmt = (select(CategoryServices, CompanyCategories)
-            .join(CompanyCategories, CategoryServices.category_id == CompanyCategories.id)
-            .filter(CompanyCategories.company_id == company_id))
-    result = await db.execute(stmt)
-    services = result.all()
-
-    # Map services to their categories
-    for service, category in services:
-        staff_members = await get_service_staff(db, service.id)
-        service_response = CategoryServiceResponse(
-            id=service.id,
-            name=service.name,
-            name_en=service.name_en,
-            name_ee=service.name_ee,
-            name_ru=service.name_ru,
-            duration=service.duration,
-            discount_price=service.discount_price,
-            price=service.price,
-            additional_info=service.additional_info,
-            additional_info_en=service.additional_info_en,
-            additional_info_ee=service.additional_info_ee,
-            additional_info_ru=service.additional_info_ru,
-            status=service.status,
-            buffer_before=service.buffer_before,
-            buffer_after=service.buffer_after,
-            service_staff=staff_members,
-            image_url=service.image_url
-        )
-        category_dict[str(category.id)]['services'].append(service_response)
-
-    # Build hierarchical structure
-    def build_category_hierarchy(cat_data) -> CompanyCategoryWithServicesResponse:
-        cat = cat_data['category']
-        subcats = []
-
-        # Find subcategories by looking for categories that have this category as parent
-        for other_cat_id, other_cat_data in category_dict.items():
-            other_cat = other_cat_data['category']
-            if other_cat.parent_category_id and str(other_cat.parent_category_id) == str(cat.id):
-                subcats.append(build_category_hierarchy(other_cat_data))
-
-        return CompanyCategoryWithServicesResponse(
-            id=cat.id,
-            name=cat.name,
-            description=cat.description,
-            parent_category_id=cat.parent_category_id,
-            services=cat_data['services'],
-            subcategories=subcats
-        )
-
-    # Get root categories (no parent) and build hierarchy
-    result_list = []
-    for cat_id, cat_data in category_dict.items():
-        if cat_data['category'].parent_category_id is None:
-            result_list.append(build_category_hierarchy(cat_data))
 
-    return result_list
+    Concurrent calls for the same company (e.g. several open tabs or the public booking page
+    under load) share a single fetch, and the result is cached for COMPANY_CATALOG_TTL_SECONDS.
+    """
+    try:
+        cached = await redis_client.get(_company_services_key(company_id))
+    except Exception as e:
+        logger.warning(f"Company catalog cache unavailable: {e}")
+        cached = None
+    if cached is not None:
+        return orjson.loads(cached)
+
+    key = str(company_id)
+    pending = _inflight_company_services.get(key)
+    if pending is not None:
+        try:
+            return await asyncio.shield(pending)
+        except asyncio.CancelledError:
+            if not pending.cancelled():
+                raise
+            # The request doing the fetch was cancelled, load on our own below
+
+    future = asyncio.get_running_loop().create_future()
+    _inflight_company_services[key] = future
+    try:
+        result = await _load_company_services(db, company_id)
+        try:
+            await redis_client.setex(_company_services_key(company_id), COMPANY_CATALOG_TTL_SECONDS,
+                                     orjson.dumps(result))
+        except Exception as e:
+            logger.warning(f"Company catalog cache unavailable: {e}")
+    except asyncio.CancelledError:
+        future.cancel()
+        raise
+    except Exception as e:
+        future.set_exception(e)
+        future.exception()  # Mark as retrieved in case nobody else was waiting
+        raise
+    else:
+        future.set_result(result)
+        return result
+    finally:
+        if _inflight_company_services.get(key) is future:
+            del _inflight_company_services[key]
+
+
+async def _load_company_services(db: AsyncSession, company_id: str) -> List[dict]:
+    result = await db.execute(_company_services_stmt, {'company_id': company_id})
+
+    # Services arrive already nested, so only the category hierarchy is linked up here:
+    # each category's subcategories list is the children list of its id
+    children = defaultdict(list)
+    for row in result:
+        # jsonb keeps no distinction between 2500 and 2500.0, and the API has always returned
+        # prices as floats (CategoryServiceResponse), so they are turned back into floats here
+        for service in row.services:
+            for field in ('price', 'discount_price'):
+                if service[field] is not None:
+                    service[field] = float(service[field])
+        children[row.parent_category_id].append({
+            'id': row.id,
+            'name': row.name,
+            'description': row.description,
+            'parent_category_id': row.parent_category_id,
+            'services': row.services,
+            'subcategories': children[row.id],
+        })
+
+    # Root categories (no parent)
+    return children[None]
 
 
 async def get_category(db: AsyncSession, category_id: str) -> Optional[CompanyCategories]:
     """
     Get a specific category by ID
     """
-    stmt = select(CompanyCategories).filter(CompanyCategories.id == category_id)
-    result = await db.execute(stmt)
-    return result.scalar_one_or_none()
+    # Primary key lookup through the identity map: no query when the session already has it
+    try:
+        category_id = uuid.UUID(str(category_id))
+    except ValueError:
+        return None
+    return await db.get(CompanyCategories, category_id)
 
 
 async def create_category(db: AsyncSession, obj_in: CompanyCategoryCreate) -> CompanyCategories:
@@ -158,7 +311,12 @@ async def create_category(db: AsyncSession, obj_in: CompanyCategoryCreate) -> Co
 
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
+    # Defaults are generated client-side and the session does not expire on
+    # commit, so only the relationships need filling in: a new category has
+    # no services and nothing to load, which avoids a refresh round trip.
+    set_committed_value(db_obj, 'category_service', [])
+    set_committed_value(db_obj, 'subcategories', None)
+    await invalidate_company_catalog(db_obj.company_id)
     return db_obj
 
 
@@ -172,7 +330,7 @@ async def update_category(db: AsyncSession, db_obj: CompanyCategories, obj_in: C
 
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
+    await invalidate_company_catalog(db_obj.company_id)
     return db_obj
 
 
@@ -180,18 +338,13 @@ async def delete_category(db: AsyncSession, category_id: str, company_id: str) -
     """
     Delete a company category
     """
-    stmt = select(CompanyCategories).filter(
-        CompanyCategories.id == category_id,
-        CompanyCategories.company_id == company_id
-    )
-    result = await db.execute(stmt)
-    db_obj = result.scalar_one_or_none()
-
-    if not db_obj:
+    db_obj = await get_category(db, category_id)
+    if not db_obj or str(db_obj.company_id) != str(company_id):
         return False
 
     await db.delete(db_obj)
     await db.commit()
+    await invalidate_company_catalog(company_id)
     return True
 
 
@@ -210,97 +363,76 @@ async def get_company_categories_hierarchical(db: AsyncSession, company_id: str)
     """
     Get all categories for a company in hierarchical structure (parent categories with their subcategories)
     Returns only root categories (those without parent_category_id) with nested subcategories
+    The tree is cached for COMPANY_CATALOG_TTL_SECONDS; cache hits are validated back into
+    CompanyCategoryHierarchical models, so callers get the same type either way.
     """
     from app.schemas.schemas import CompanyCategoryHierarchical
 
-    # Get all categories for the company
-    stmt = select(CompanyCategories).filter(CompanyCategories.company_id == company_id)
-    result = await db.execute(stmt)
-    all_categories = result.scalars().all()
-
-    # Build a dictionary for quick lookup
-    category_dict = {str(cat.id): cat for cat in all_categories}
-
-    # Build hierarchical structure
-    def build_hierarchy(category: CompanyCategories) -> CompanyCategoryHierarchical:
-        subcats = [build_hierarchy(category_dict[str(sub.id)])
-                   for sub in category.subcategories if str(sub.id) in category_dict]
-
-        return CompanyCategoryHierarchical(
-            id=category.id,
-            company_id=category.company_id,
-            parent_category_id=category.parent_category_id,
-            name=category.name,
-            name_en=category.name_en,
-            name_ee=category.name_ee,
-            name_ru=category.name_ru,
-            description=category.description,
-            description_en=category.description_en,
-            description_ee=category.description_ee,
-            description_ru=category.description_ru,
-            created_at=category.created_at,
-            updated_at=category.updated_at,
-            services_count=category.services_count,
-            has_subcategories=category.has_subcategories,
-            subcategories=subcats
-        )
-
-    # Get root categories (no parent)
-    root_categories = [cat for cat in all_categories if cat.parent_category_id is None]
-
-    # Build hierarchy for each root
-    return [build_hierarchy(cat) for cat in root_categories]
-
-
-async def category_has_subcategories(db: AsyncSession, category_id: str) -> bool:
-    """
-    Check if a category has any subcategories
-    """
-    stmt = select(func.count()).select_from(CompanyCategories).filter(
-        CompanyCategories.parent_category_id == category_id
-    )
+    try:
+        cached = await redis_client.get(_company_categories_key(company_id))
+    except Exception as e:
+        logger.warning(f"Company catalog cache unavailable: {e}")
+        cached = None
+    if cached is not None:
+        return [CompanyCategoryHierarchical.model_validate(node) for node in orjson.loads(cached)]
+
+    # Get all categories for the company with their service counts. Every rendered column is
+    # selected as a plain column, so rows skip ORM entity hydration and the identity map
+    services_count = (select(func.count(CategoryServices.id))
+                      .where(CategoryServices.category_id == CompanyCategories.id)
+                      .correlate(CompanyCategories)
+                      .scalar_subquery())
+    stmt = (select(*_CATEGORY_COLUMNS, services_count.label('services_count'))
+            .filter(CompanyCategories.company_id == company_id))
     result = await db.execute(stmt)
-    count = result.scalar()
-    return count > 0
 
+    # Build every node first, then link each one under its parent in a single pass; no
+    # recursion, so tree depth has no cost beyond the rows themselves. Values come straight
+    # from typed columns, so the models are built without re-validation
+    nodes = {}
+    for row in result.mappings():
+        nodes[row['id']] = CompanyCategoryHierarchical.model_construct(
+            **row,
+            has_subcategories=False,
+            subcategories=[]
+        )
 
-async def validate_service_category(db: AsyncSession, category_id: str) -> tuple[bool, str]:
-    """
-    Validate if services can be added to this category.
-    Returns (is_valid, error_message)
-
-    Rules:
-    - Services can only be added to categories that don't have subcategories
-    """
-    category = await get_category(db, category_id)
-    if not category:
-        return False, "Category not found"
+    roots = []
+    for node in nodes.values():
+        if node.parent_category_id is None:
+            roots.append(node)
+            continue
+        parent = nodes.get(node.parent_category_id)
+        if parent is not None:
+            parent.subcategories.append(node)
+            parent.has_subcategories = True
 
-    if await category_has_subcategories(db, category_id):
-        return False, "Cannot add services to a category that has subcategories. Please add services to the subcategories instead."
+    try:
+        await redis_client.setex(_company_categories_key(company_id), COMPANY_CATALOG_TTL_SECONDS,
+                                 orjson.dumps(roots, default=lambda node: node.model_dump()))
+    except Exception as e:
+        logger.warning(f"Company catalog cache unavailable: {e}")
 
-    return True, ""
+    # Root categories (no parent) with their nested subcategories
+    return roots
 
 
 async def create_service(db: AsyncSession, obj_in: CategoryServiceCreate) -> CategoryServices:
     """
     Create a new service within a category
-    Validates that the category doesn't have subcategories
+    Raises ValueError when the category does not exist or has subcategories (checked by the
+    database as part of the INSERT)
     """
-    # Validate category before creating service
-    is_valid, error_msg = await validate_service_category(db, str(obj_in.category_id))
-    if not is_valid:
-        raise ValueError(error_msg)
-
-    db_obj = CategoryServices(
+    stmt = insert(CategoryServices).values(
+        id=uuid.uuid4(),
         category_id=obj_in.category_id,
         name=obj_in.name,
         name_en=obj_in.name_en,
         name_ee=obj_in.name_ee,
         name_ru=obj_in.name_ru,
         duration=obj_in.duration,
-        price=int(obj_in.price),  # Store price in cents
-        discount_price=int((obj_in.discount_price or 0)),
+        price=obj_in.price,
+        discount_price=obj_in.discount_price or 0,
         additional_info_ee=obj_in.additional_info_ee,
         additional_info_en=obj_in.additional_info_en,
         additional_info_ru=obj_in.additional_info_ru,
@@ -308,37 +440,27 @@ async def create_service(db: AsyncSession, obj_in: CategoryServiceCreate) -> Cat
         buffer_before=obj_in.buffer_before,
         buffer_after=obj_in.buffer_after,
         image_url=obj_in.image_url
-    )
-
-    db.add(db_obj)
+    ).returning(CategoryServices)
+    try:
+        db_obj = await db.scalar(stmt)
+    except IntegrityError as e:
+        await db.rollback()
+        _raise_for_category_violation(e)
+
+    # Assign staff members to the service in the same transaction as the service row
+    await assign_staff_to_service(db, db_obj.id, obj_in.staff_ids or [], commit=False)
     await db.commit()
-    await db.refresh(db_obj)
+    await _invalidate_category_company_catalog(db, db_obj.category_id)
 
-    # Assign staff members to the service
-    if obj_in.staff_ids:
-        await assign_staff_to_service(db, db_obj.id, obj_in.staff_ids)
-
-    await db.refresh(db_obj)
     return db_obj
 
 
 async def update_service(db: AsyncSession, db_obj: CategoryServices, obj_in: CategoryServiceUpdate) -> CategoryServices:
     """
     Update an existing service
-    Validates category if being changed
+    Raises ValueError when moving it to a category that does not exist or has subcategories
+    (checked by the database as part of the UPDATE)
     """
-    # Validate new category if provided
-    if obj_in.category_id and str(obj_in.category_id) != str(db_obj.category_id):
-        is_valid, error_msg = await validate_service_category(db, str(obj_in.category_id))
-        if not is_valid:
-            raise ValueError(error_msg)
-
-    # Handle price conversion
-    if obj_in.price is not None:
-        obj_in.price = int(obj_in.price)
-    if obj_in.discount_price is not None:
-        obj_in.discount_price = int(obj_in.discount_price)
-
     update_data = obj_in.model_dump(exclude_unset=True)
 
     # Handle staff_ids and remove_image separately
@@ -354,57 +476,53 @@ async def update_service(db: AsyncSession, db_obj: CategoryServices, obj_in: Cat
         setattr(db_obj, field, value)
 
     db.add(db_obj)
-    await db.commit()
-    await db.refresh(db_obj)
+    try:
+        await db.flush()
+    except IntegrityError as e:
+        await db.rollback()
+        _raise_for_category_violation(e)
 
     # Update staff assignments if provided
     if staff_ids is not None:
-        # Remove existing assignments
-        stmt = delete(ServiceStaff).filter(ServiceStaff.service_id == db_obj.id)
+        # Remove only the assignments that are no longer wanted; kept ones stay untouched
+        stmt = delete(ServiceStaff).filter(ServiceStaff.service_id == db_obj.id,
+                                           ServiceStaff.user_id.not_in(staff_ids))
         await db.execute(stmt)
-        await db.commit()
 
-        # Add new assignments
-        if staff_ids:
-            await assign_staff_to_service(db, db_obj.id, staff_ids)
+        # Add missing assignments (existing ones are skipped by the insert)
+        await assign_staff_to_service(db, db_obj.id, staff_ids, commit=False)
 
+    # Service fields and staff assignments are committed together
+    await db.commit()
+    await _invalidate_category_company_catalog(db, db_obj.category_id)
     return db_obj
 
 
-async def assign_staff_to_service(db: AsyncSession, service_id: UUID4, staff_ids: List[UUID4]) -> None:
+async def assign_staff_to_service(db: AsyncSession, service_id: UUID4, staff_ids: List[UUID4],
+                                  commit: bool = True) -> None:
     """
     Assign multiple staff members to a service
-    """
-    for staff_id in staff_ids:
-        # Check if assignment already exists
-        stmt = (select(ServiceStaff)
-            .options(selectinload(ServiceStaff.user))
-            .filter(
-                ServiceStaff.service_id == service_id,
-                ServiceStaff.user_id == staff_id
-            ))
-        result = await db.execute(stmt)
-        existing = result.scalar_one_or_none()
-
-        if not existing:
-            staff_assignment = ServiceStaff(
-                service_id=service_id,
-                user_id=staff_id
-            )
-            db.add(staff_assignment)
-
-    await db.commit()
+    Pass commit=False to leave committing to the caller (e.g. to share its transaction)
+    """
+    if not staff_ids:
+        return
+
+    # Existing assignments are skipped by the (service_id, user_id) unique constraint. Rows are
+    # passed as executemany parameters rather than one VALUES list, so the statement stays the
+    # same for any number of staff and large lists can't hit the driver's bind parameter limit
+    stmt = pg_insert(ServiceStaff).on_conflict_do_nothing(constraint='_service_user_uc')
+    await db.execute(stmt, [{'id': uuid.uuid4(), 'service_id': service_id, 'user_id': staff_id}
+                            for staff_id in dict.fromkeys(staff_ids)])
+    if commit:
+        await db.commit()
+        await _invalidate_service_company_catalog(db, service_id)
 
 
 async def get_service_staff(db: AsyncSession, service_id: UUID4) -> List[ServiceStaff]:
     """
     Get all staff members assigned to a service
     """
-    stmt = (select(ServiceStaff)
-            .options(selectinload(ServiceStaff.user))
-            .options(selectinload(ServiceStaff.service))
-            .filter(ServiceStaff.service_id == service_id))
-    result = await db.execute(stmt)
+    result = await db.execute(_service_staff_stmt, {'service_id': service_id})
     staff = result.scalars().all()
     return staff
 
@@ -423,6 +541,7 @@ async def remove_staff_from_service(db: AsyncSession, service_id: UUID4, staff_i
     if assignment:
         await db.delete(assignment)
         await db.commit()
+        await _invalidate_service_company_catalog(db, service_id)
         return True
     return False
 
@@ -432,48 +551,70 @@ async def copy_service(db: AsyncSession, service_id: str, company_id: str) -> Op
     Create a copy of an existing service with all its properties and staff assignments.
     The copied service will have " (Copy)" appended to its name.
     """
-    # Get the original service
-    original_service = await get_service(db=db, service_id=service_id, company_id=company_id)
-    if not original_service:
+    # Copy the service row inside the database, scoped to the caller's company
+    new_service_id = uuid.uuid4()
+    copy_suffix = " (Copy)"
+    now = func.now()
+    service_row = (
+        select(
+            literal(new_service_id, CategoryServices.id.type),
+            CategoryServices.category_id,
+            # Empty names stay NULL rather than becoming just the suffix
+            func.nullif(CategoryServices.name, '') + copy_suffix,
+            func.nullif(CategoryServices.name_en, '') + copy_suffix,
+            func.nullif(CategoryServices.name_ee, '') + copy_suffix,
+            func.nullif(CategoryServices.name_ru, '') + copy_suffix,
+            CategoryServices.duration,
+            CategoryServices.price,
+            CategoryServices.discount_price,
+            CategoryServices.additional_info,
+            CategoryServices.additional_info_en,
+            CategoryServices.additional_info_ee,
+            CategoryServices.additional_info_ru,
+            CategoryServices.status,
+            CategoryServices.buffer_before,
+            CategoryServices.buffer_after,
+            CategoryServices.image_url,  # Copy the same image URL
+            now,
+            now,
+        )
+        .join(CompanyCategories, CategoryServices.category_id == CompanyCategories.id)
+        .where(CategoryServices.id == service_id, CompanyCategories.company_id == company_id)
+    )
+    stmt = (
+        insert(CategoryServices)
+        .from_select(
+            ['id', 'category_id', 'name', 'name_en', 'name_ee', 'name_ru', 'duration', 'price',
+             'discount_price', 'additional_info', 'additional_info_en', 'additional_info_ee',
+             'additional_info_ru', 'status', 'buffer_before', 'buffer_after', 'image_url',
+             'created_at', 'updated_at'],
+            service_row,
+        )
+        .returning(CategoryServices)
+    )
+    new_service = await db.scalar(stmt)
+    if not new_service:
         return None
 
-    # Get staff assignments for the original service
-    staff_assignments = await get_service_staff(db=db, service_id=original_service.id)
-    staff_ids = [assignment.user_id for assignment in staff_assignments]
-
-    # Create a new service with copied data
-    new_service = CategoryServices(
-        category_id=original_service.category_id,
-        name=f"{original_service.name} (Copy)" if original_service.name else None,
-        name_en=f"{original_service.name_en} (Copy)" if original_service.name_en else None,
-        name_ee=f"{original_service.name_ee} (Copy)" if original_service.name_ee else None,
-        name_ru=f"{original_service.name_ru} (Copy)" if original_service.name_ru else None,
-        duration=original_service.duration,
-        price=original_service.price,
-        discount_price=original_service.discount_price,
-        additional_info_ee=original_service.additional_info_ee,
-        additional_info_en=original_service.additional_info_en,
-        additional_info_ru=original_service.additional_info_ru,
-        status=original_service.status,
-        buffer_before=original_service.buffer_before,
-        buffer_after=original_service.buffer_after,
-        image_url=original_service.image_url  # Copy the same image URL
+    # Copy staff assignments
+    staff_rows = (
+        select(func.gen_random_uuid(), literal(new_service_id, ServiceStaff.service_id.type),
+               ServiceStaff.user_id, now, now)
+        .where(ServiceStaff.service_id == service_id)
+    )
+    await db.execute(
+        insert(ServiceStaff)
+        .from_select(['id', 'service_id', 'user_id', 'created_at', 'updated_at'], staff_rows)
     )
 
-    db.add(new_service)
     await db.commit()
-    await db.refresh(new_service)
-
-    # Copy staff assignments
-    if staff_ids:
-        await assign_staff_to_service(db, new_service.id, staff_ids)
-
+    await invalidate_company_catalog(company_id)
     return new_service
 
 
 async def delete_service(db: AsyncSession, service_id: UUID4, company_id: Optional[UUID4] = None) -> bool:
     """
-    Delete a service and any staff assignments tied to it.
+    Delete a service and, through the FK cascade, any staff assignments tied to it.
 
     If company_id is provided, ensure the service belongs to a category for that company
     before deleting (extra safety).
@@ -481,26 +622,34 @@ async def delete_service(db: AsyncSession, service_id: UUID4, company_id: Option
     Returns True when deletion happened, False when the service was not found or the
     company check failed.
     """
-    # If company_id is provided, ensure the service belongs to that company
+    # If company_id is provided, only match the service when its category belongs to that company
+    service_filter = [CategoryServices.id == service_id]
     if company_id:
-        stmt = (select(CategoryServices)
-                .join(CompanyCategories, CategoryServices.category_id == CompanyCategories.id)
-                .filter(CategoryServices.id == service_id, CompanyCategories.company_id == company_id))
-        result = await db.execute(stmt)
-        service = result.scalar_one_or_none()
-    else:
-        stmt = select(CategoryServices).filter(CategoryServices.id == service_id)
-        result = await db.execute(stmt)
-        service = result.scalar_one_or_none()
+        service_filter.append(exists().where(CompanyCategories.id == CategoryServices.category_id,
+                                             CompanyCategories.company_id == company_id))
+    matched_service = select(CategoryServices.id).where(*service_filter)
+
+    # Keep booking history: detach booked services instead of letting the FK cascade delete them
+    stmt = (update(BookingServices)
+            .where(BookingServices.category_service_id.in_(matched_service))
+            .values(category_service_id=None)
+            .execution_options(synchronize_session=False))
+    await db.execute(stmt)
 
-    if not service:
+    # Delete the service itself; service_staff rows go with it via ON DELETE CASCADE
+    stmt = (delete(CategoryServices)
+            .where(*service_filter)
+            .returning(CategoryServices.category_id)
+            .execution_options(synchronize_session=False))
+    result = await db.execute(stmt)
+    deleted = result.first()
+    if deleted is None:
+        await db.rollback()
         return False
 
-    # Remove any ServiceStaff assignments for this service
-    stmt = delete(ServiceStaff).filter(ServiceStaff.service_id == service_id)
-    await db.execute(stmt)
-
-    # Delete the service itself
-    await db.delete(service)
     await db.commit()
+    if company_id:
+        await invalidate_company_catalog(company_id)
+    else:
+        await _invalidate_category_company_catalog(db, deleted.category_id)
     return True
@@ -1,11 +1,10 @@
-import uuid
 from typing import Optional, List
 from datetime import datetime, timezone
 
 from pydantic.v1 import UUID4
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select
-from sqlalchemy.orm import selectinload
+from sqlalchemy import select, update, bindparam
+from sqlalchemy.orm import lazyload
 
 from app.models import CompanyUsers, CustomerStatusType
 from app.models.models import Users, UserVerifications
@@ -17,10 +16,35 @@ from app.schemas.schemas import (
 from app.core.datetime_utils import utcnow
 
 
+# Active members of a company with the user columns rendered by the CompanyUser schema,
+# selected as plain columns in one query
+_company_users_stmt = (
+    select(CompanyUsers.id, CompanyUsers.user_id, CompanyUsers.company_id, CompanyUsers.role,
+           CompanyUsers.status, CompanyUsers.created_at, CompanyUsers.updated_at,
+           Users.first_name, Users.last_name, Users.email, Users.phone, Users.languages, Users.position,
+           Users.profile_photo_url, Users.status.label('user_status'),
+           Users.created_at.label('user_created_at'), Users.updated_at.label('user_updated_at'))
+    .join(Users, Users.id == CompanyUsers.user_id)
+    .filter(Users.status == 'active',
+            CompanyUsers.company_id == bindparam('company_id'),
+            CompanyUsers.status == 'active')
+)
+
+
 async def get(db: AsyncSession, id: UUID4) -> Optional[tuple[Users, UUID4]]:
+    """
+    Get a user with the id of their company (None when they have none)
+
+    A user linked to several companies gets their earliest membership. This runs for every
+    authenticated request, so the user's relationships (memberships, time offs, booked
+    services) are not loaded; none of the callers read them.
+    """
     stmt = (select(Users, CompanyUsers.company_id)
+            .options(lazyload('*'))
             .outerjoin(CompanyUsers, CompanyUsers.user_id == Users.id)
-            .filter(Users.id == id))
+            .filter(Users.id == id)
+            .order_by(CompanyUsers.created_at)
+            .limit(1))
     result = await db.execute(stmt)
     return result.first()
 
@@ -38,11 +62,11 @@ async def get_by_email(db: AsyncSession, email: str) -> Optional[Users]:
 
 
 async def create(db: AsyncSession, *, obj_in: UserCreate) -> Users:
+    # The id comes back from the INSERT (RETURNING) and the session does not expire on commit,
+    # so the instance is complete without a refresh
     db_obj = Users(**obj_in.model_dump(exclude={'availabilities'}))
-    db_obj.id = str(uuid.uuid4())
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
 
@@ -62,9 +86,9 @@ async def update(db: AsyncSession, *, db_obj: Users, obj_in: UserUpdate) -> User
     # Ensure updated_at is set to current UTC time
     db_obj.updated_at = utcnow()
     
+    # Only the changed columns are written, and the instance already holds the new values
     db.add(db_obj)
     await db.commit()
-    await db.refresh(db_obj)
     return db_obj
 
 
@@ -81,23 +105,20 @@ async def get_verification_token(db: AsyncSession, token: str, type: str) -> Opt
 async def verify_token(db: AsyncSession, db_obj: UserVerifications) -> bool:
     """Mark verification token as verified and update user email_verified status"""
     try:
-        db_obj.status = VerificationStatus.VERIFIED
-        db_obj.used_at = utcnow()
+        now = utcnow()
+        # Two UPDATEs in one transaction, without loading the user first. The default
+        # session synchronisation keeps any loaded instances (db_obj, a just created user)
+        # in step with the new values, so nothing needs refreshing
+        await db.execute(update(UserVerifications)
+                         .where(UserVerifications.id == db_obj.id)
+                         .values(status=VerificationStatus.VERIFIED, used_at=now))
 
         # Update user's email_verified status
-        stmt = select(Users).filter(Users.id == db_obj.user_id)
-        result = await db.execute(stmt)
-        user = result.scalar_one_or_none()
+        await db.execute(update(Users)
+                         .where(Users.id == db_obj.user_id)
+                         .values(email_verified=True, status=CustomerStatusType.active, updated_at=now))
 
-        if user:
-            user.email_verified = True
-            user.status = CustomerStatusType.active
-            user.updated_at = utcnow()
-            db.add(user)
-
-        db.add(db_obj)
         await db.commit()
-        await db.refresh(db_obj)
         return True
     except Exception:
         await db.rollback()
@@ -108,15 +129,35 @@ async def get_company_users(db: AsyncSession, company_id: str) -> List[CompanyUs
     """
     Get all users for a company
     """
-    stmt = (select(CompanyUsers)
-            .options(selectinload(CompanyUsers.user))
-            .join(Users, Users.id == CompanyUsers.user_id)
-            .filter(Users.status == 'active',
-                    CompanyUsers.company_id == company_id,
-                    CompanyUsers.status == 'active'))
-    result = await db.execute(stmt)
-    users = result.scalars().all()
-    return users
+    result = await db.execute(_company_users_stmt, {'company_id': company_id})
+
+    # Rows come straight from typed columns, so the response models are built without
+    # re-validation and no ORM objects are created
+    return [
+        CompanyUser.model_construct(
+            id=row.id,
+            user_id=row.user_id,
+            company_id=row.company_id,
+            role=row.role,
+            status=row.status,
+            created_at=row.created_at,
+            updated_at=row.updated_at,
+            user=User.model_construct(
+                id=row.user_id,
+                first_name=row.first_name,
+                last_name=row.last_name,
+                email=row.email,
+                phone=row.phone,
+                languages=row.languages,
+                position=row.position,
+                profile_photo_url=row.profile_photo_url,
+                status=row.user_status,
+                created_at=row.user_created_at,
+                updated_at=row.user_updated_at,
+            ),
+        )
+        for row in result
+    ]
 
 
 async def get_company_by_user(db: AsyncSession, user_id: str) -> Optional[CompanyUsers]:
@@ -1,8 +1,9 @@
+from collections import defaultdict
 from typing import List, Optional, Any
-from datetime import datetime, date, time, timedelta
+from datetime import date, datetime, time, timedelta
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, delete
-import uuid
+from sqlalchemy import select, delete, tuple_
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from app.models.models import UserAvailabilities, UserTimeOffs
 from app.models.enums import AvailabilityType
 from app.schemas.schemas import (
@@ -18,15 +19,15 @@ from app.core.datetime_utils import utcnow, convert_utc_to_timezone
 
 async def create_user_availability(db: AsyncSession, user_id: str, availability_in: UserAvailabilityCreate) -> UserAvailabilities:
     """Create a new availability entry for a user"""
+    now = utcnow()
     db_availability = UserAvailabilities(
-        id=str(uuid.uuid4()),
         user_id=user_id,
         day_of_week=availability_in.day_of_week,
         start_time=availability_in.start_time,
         end_time=availability_in.end_time,
         is_available=availability_in.is_available,
-        created_at=utcnow(),
-        updated_at=utcnow()
+        created_at=now,
+        updated_at=now
     )
     db.add(db_availability)
     await db.commit()
@@ -36,24 +37,25 @@ async def create_user_availability(db: AsyncSession, user_id: str, availability_
 
 async def bulk_create_user_availabilities(db: AsyncSession, user_id: str, availabilities: List[UserAvailabilityCreate]) -> List[UserAvailabilities]:
     """Create multiple availability entries for a user"""
+    # One timestamp for the whole batch
+    now = utcnow()
     db_availabilities = []
     for availability_in in availabilities:
         db_availability = UserAvailabilities(
-            id=str(uuid.uuid4()),
             user_id=user_id,
             day_of_week=availability_in.day_of_week,
             start_time=availability_in.start_time,
             end_time=availability_in.end_time,
             is_available=availability_in.is_available,
-            created_at=utcnow(),
-            updated_at=utcnow()
+            created_at=now,
+            updated_at=now
         )
         db_availabilities.append(db_availability)
     
+    # Every column is set here and the session does not expire on commit, so the instances
+    # are complete without refreshing them one by one
     db.add_all(db_availabilities)
     await db.commit()
-    for db_availability in db_availabilities:
-        await db.refresh(db_availability)
     return db_availabilities
 
 
@@ -67,13 +69,43 @@ async def delete_user_availabilities(db: AsyncSession, user_id: str) -> bool:
 
 async def update_user_availabilities(db: AsyncSession, user_id: str, availabilities: List[UserAvailabilityCreate]) -> List[UserAvailabilities]:
     """Replace all availability entries for a user with new ones"""
-    # Delete existing availabilities
-    await delete_user_availabilities(db, user_id)
+    now = utcnow()
+    # One row per slot, as unique_user_availability allows; the last entry for a slot wins
+    rows = {}
+    for availability_in in availabilities:
+        rows[(availability_in.day_of_week, availability_in.start_time, availability_in.end_time)] = {
+            'user_id': user_id,
+            'day_of_week': availability_in.day_of_week,
+            'start_time': availability_in.start_time,
+            'end_time': availability_in.end_time,
+            'is_available': availability_in.is_available,
+            'created_at': now,
+            'updated_at': now
+        }
+
+    # Upsert the new schedule so slots that did not change keep their rows
+    db_availabilities = []
+    if rows:
+        stmt = pg_insert(UserAvailabilities).values(list(rows.values()))
+        stmt = (stmt.on_conflict_do_update(
+                    constraint='unique_user_availability',
+                    set_={'is_available': stmt.excluded.is_available, 'updated_at': now}
+                )
+                .returning(UserAvailabilities))
+        result = await db.scalars(stmt, execution_options={"populate_existing": True})
+        db_availabilities = list(result.all())
 
-    # Create new availabilities
-    if availabilities:
-        return await bulk_create_user_availabilities(db, user_id, availabilities)
-    return []
+    # Then drop the slots the new schedule no longer has
+    stmt = delete(UserAvailabilities).filter(UserAvailabilities.user_id == user_id)
+    if rows:
+        stmt = stmt.filter(tuple_(UserAvailabilities.day_of_week,
+                                  UserAvailabilities.start_time,
+                                  UserAvailabilities.end_time).not_in(list(rows)))
+    await db.execute(stmt)
+
+    # The old schedule is replaced atomically, with a single commit
+    await db.commit()
+    return db_availabilities
 
 
 async def get_user_availabilities(db: AsyncSession, user_id: str) -> List[UserAvailabilities]:
@@ -115,80 +147,131 @@ async def get_all_time_offs(db: AsyncSession, start_date: date, end_date: date):
     result = await db.execute(stmt)
     return list(result.scalars().all())
 
-def subtract_intervals(base_start: time, base_end: time, intervals: List[tuple]) -> List[tuple]:
-    """Subtract intervals (bookings/time-offs) from a base interval. Returns list of available intervals."""
-    result = [(base_start, base_end)]
-    for interval_start, interval_end in intervals:
-        new_result = []
-        for avail_start, avail_end in result:
-            # If no overlap, keep as is
-            if interval_end <= avail_start or interval_start >= avail_end:
-                new_result.append((avail_start, avail_end))
-            else:
-                # Overlap: split interval
-                if interval_start > avail_start:
-                    new_result.append((avail_start, interval_start))
-                if interval_end < avail_end:
-                    new_result.append((interval_end, avail_end))
-        result = new_result
+
+MINUTES_PER_DAY = 24 * 60
+
+
+def to_minutes(value: time, round_up: bool = False) -> int:
+    """
+    Minutes since midnight of a time of day
+    With round_up, a partly elapsed minute counts as a whole one (for the end of a busy period)
+    """
+    minutes = value.hour * 60 + value.minute
+    if round_up and (value.second or value.microsecond):
+        minutes += 1
+    return minutes
+
+
+def from_minutes(minutes: int) -> time:
+    """Time of day for a count of minutes since midnight"""
+    return time(minutes // 60, minutes % 60)
+
+
+def subtract_intervals(base_start: int, base_end: int, intervals: List[tuple]) -> List[tuple]:
+    """
+    Subtract intervals (bookings/time-offs) from a base interval. Returns list of available intervals.
+    Bounds are minutes since midnight
+    """
+    # Sweep the intervals in start order, emitting the gaps between the base start, the busy
+    # stretches and the base end; overlapping intervals coalesce as the cursor only moves forward
+    result = []
+    cursor = base_start
+    for interval_start, interval_end in sorted(intervals):
+        if interval_start >= base_end:
+            break
+        if interval_start > cursor:
+            result.append((cursor, interval_start))
+        if interval_end > cursor:
+            cursor = interval_end
+    if cursor < base_end:
+        result.append((cursor, base_end))
     return result
 
-def get_daily_slots(target_date: date, availabilities: List[UserAvailabilities], time_offs: List[UserTimeOffs], bookings: List[Any], service_duration_minutes: Optional[int] = None, company_timezone: str = "UTC") -> DailyAvailability:
-    day_of_week = target_date.weekday()
-    day_availabilities = [a for a in availabilities if a.day_of_week == day_of_week]
-    # Collect intervals to subtract (bookings and time-offs)
-    subtract_intervals_list = []
+def to_local_intervals(intervals: List[tuple], company_timezone: str) -> List[tuple]:
+    """Convert (start, end) UTC datetime pairs to the company timezone"""
+    return [(convert_utc_to_timezone(start, company_timezone), convert_utc_to_timezone(end, company_timezone))
+            for start, end in intervals]
+
+
+def clip_to_day(start: datetime, end: datetime, target_date: date) -> tuple:
+    """
+    Minutes since midnight a local (start, end) pair covers on target_date
+    Parts before or after the day are cut off at its midnights
+    """
+    start_minutes = to_minutes(start) if start.date() == target_date else 0
+    end_minutes = to_minutes(end, round_up=True) if end.date() == target_date else MINUTES_PER_DAY
+    return start_minutes, end_minutes
+
+
+def bucket_by_local_date(local_intervals: List[tuple], first_date: date, last_date: date) -> defaultdict:
+    """
+    Group local (start, end) pairs by every date between first_date and last_date they touch, each
+    clipped to its date as minutes since midnight
+    """
+    by_date = defaultdict(list)
+    for start, end in local_intervals:
+        current_date = max(start.date(), first_date)
+        # An interval ending exactly at midnight does not touch the day that starts then
+        end_date = end.date() - timedelta(days=1) if end > start and end.time() == time.min else end.date()
+        bucket_end = min(end_date, last_date)
+        while current_date <= bucket_end:
+            by_date[current_date].append(clip_to_day(start, end, current_date))
+            current_date += timedelta(days=1)
+    return by_date
+
 
-    # Process time-offs: convert from UTC to company timezone
-    for time_off, user_id in time_offs:
-        # Convert UTC datetime to company timezone
-        start_date_local = convert_utc_to_timezone(time_off.start_date, company_timezone)
-        end_date_local = convert_utc_to_timezone(time_off.end_date, company_timezone)
+def get_availability_window(availability_type: AvailabilityType, date_from: date) -> tuple:
+    """First and last date covered by an availability calculation"""
+    if availability_type == AvailabilityType.DAILY:
+        return date_from, date_from
+    if availability_type == AvailabilityType.WEEKLY:
+        return date_from, date_from + timedelta(days=6)
+    month_start = date_from.replace(day=1)
+    if month_start.month == 12:
+        month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(days=1)
+    else:
+        month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(days=1)
+    return month_start, month_end
 
-        if start_date_local.date() <= target_date <= end_date_local.date():
-            subtract_intervals_list.append((time(start_date_local.hour, start_date_local.minute),
-                                            time(end_date_local.hour, end_date_local.minute)))
 
-    # Process bookings: convert from UTC to company timezone
-    for booking in bookings:
-        # Convert UTC datetime to company timezone
-        start_at_local = convert_utc_to_timezone(booking.start_at, company_timezone)
-        end_at_local = convert_utc_to_timezone(booking.end_at, company_timezone)
+def get_daily_slots(target_date: date, day_availabilities: List[UserAvailabilities], day_time_offs: List[tuple], day_bookings: List[tuple], service_duration_minutes: Optional[int] = None) -> DailyAvailability:
+    """
+    Free slots on target_date; day_availabilities are the working hours for its weekday, day_time_offs
+    and day_bookings the parts of the time-offs and bookings on target_date as minutes since midnight
+    """
+    # Nothing to subtract from on a day off
+    if not day_availabilities:
+        return DailyAvailability.model_construct(date=target_date, time_slots=[])
 
-        if start_at_local.date() == target_date:
-            subtract_intervals_list.append((start_at_local.time(), end_at_local.time()))
+    # Intervals to subtract (bookings and time-offs), already as minutes since midnight
+    subtract_intervals_list = day_time_offs + day_bookings
 
+    # The slots below are built from already validated values, so Pydantic validation is skipped
     time_slots = []
     for avail in day_availabilities:
-        available_intervals = subtract_intervals(avail.start_time, avail.end_time, subtract_intervals_list)
+        available_intervals = subtract_intervals(to_minutes(avail.start_time), to_minutes(avail.end_time),
+                                                 subtract_intervals_list)
         for start, end in available_intervals:
             # If service_duration_minutes is provided, filter slots that don't have enough time
             if service_duration_minutes:
-                # Calculate the duration of this slot in minutes
-                start_datetime = datetime.combine(target_date, start)
-                end_datetime = datetime.combine(target_date, end)
-                slot_duration_minutes = (end_datetime - start_datetime).total_seconds() / 60
-                
                 # Only include slots that have enough time for the service
                 # Adjust end_time to be service_duration_minutes before the actual end
-                if slot_duration_minutes >= service_duration_minutes:
-                    # Calculate the last possible start time
-                    last_start_time = (datetime.combine(target_date, end) - timedelta(minutes=service_duration_minutes)).time()
-                    if start < last_start_time:
-                        time_slots.append(TimeSlot(
-                            start_time=start,
-                            end_time=last_start_time,
-                            is_available=True
-                        ))
+                last_start = end - service_duration_minutes
+                if start < last_start:
+                    time_slots.append(TimeSlot.model_construct(
+                        start_time=from_minutes(start),
+                        end_time=from_minutes(last_start),
+                        is_available=True
+                    ))
             else:
                 # No service duration provided, include the full slot
                 if start < end:
-                    time_slots.append(TimeSlot(
-                        start_time=start,
-                        end_time=end,
+                    time_slots.append(TimeSlot.model_construct(
+                        start_time=from_minutes(start),
+                        end_time=from_minutes(end),
                         is_available=True
                     ))
-    return DailyAvailability(
+    return DailyAvailability.model_construct(
         date=target_date,
         time_slots=time_slots
     )
@@ -212,22 +295,38 @@ def calculate_availability(
                 weekly=None,
                 monthly=None
             )
+
+        # Bucket working hours by weekday once instead of filtering them again for every date
+        availabilities_by_weekday = defaultdict(list)
+        for availability in availabilities:
+            availabilities_by_weekday[availability.day_of_week].append(availability)
+
+        # Convert time-offs and bookings to the company timezone once, not again for every date
+        local_time_offs = to_local_intervals([(time_off.start_date, time_off.end_date) for time_off, _ in time_offs],
+                                             company_timezone)
+        local_bookings = to_local_intervals([(booking.start_at, booking.end_at) for booking in bookings],
+                                            company_timezone)
+
+        # Bucket them by local date so each day only looks at its own events
+        window_start, window_end = get_availability_window(availability_type, date_from)
+        timeoffs_by_date = bucket_by_local_date(local_time_offs, window_start, window_end)
+        bookings_by_date = bucket_by_local_date(local_bookings, window_start, window_end)
+
         if availability_type == AvailabilityType.DAILY:
-            daily = get_daily_slots(date_from, availabilities, time_offs, bookings, service_duration_minutes, company_timezone)
+            daily = get_daily_slots(date_from, availabilities_by_weekday[date_from.weekday()], timeoffs_by_date[date_from], bookings_by_date[date_from], service_duration_minutes)
             return AvailabilityResponse(
                 user_id=str(availabilities[0].user_id),
                 availability_type=availability_type,
                 daily=daily
             )
         elif availability_type == AvailabilityType.WEEKLY:
-            week_start = date_from
-            week_end = week_start + timedelta(days=6)
+            week_start, week_end = window_start, window_end
             daily_slots = []
             current_date = week_start
             while current_date <= week_end:
-                daily_slots.append(get_daily_slots(current_date, availabilities, time_offs, bookings, service_duration_minutes, company_timezone))
+                daily_slots.append(get_daily_slots(current_date, availabilities_by_weekday[current_date.weekday()], timeoffs_by_date[current_date], bookings_by_date[current_date], service_duration_minutes))
                 current_date += timedelta(days=1)
-            weekly = WeeklyAvailability(
+            weekly = WeeklyAvailability.model_construct(
                 week_start_date=week_start,
                 week_end_date=week_end,
                 daily_slots=daily_slots
@@ -238,11 +337,10 @@ def calculate_availability(
                 weekly=weekly
             )
         else:  # MONTHLY
-            month_start = date_from.replace(day=1)
-            if month_start.month == 12:
-                month_end = month_start.replace(year=month_start.year + 1, month=1, day=1) - timedelta(days=1)
-            else:
-                month_end = month_start.replace(month=month_start.month + 1, day=1) - timedelta(days=1)
+            month_start, month_end = window_start, window_end
+            # Days with the same weekday and the same events get the same slots, so each
+            # combination is computed once and later days only swap in their date
+            daily_slots_cache = {}
             weekly_slots = []
             current_date = month_start
             while current_date <= month_end:
@@ -252,15 +350,23 @@ def calculate_availability(
                 week_date = week_start
                 while week_date <= week_end:
                     if month_start <= week_date <= month_end:
-                        daily_slots.append(get_daily_slots(week_date, availabilities, time_offs, bookings, service_duration_minutes, company_timezone))
+                        day_time_offs = timeoffs_by_date[week_date]
+                        day_bookings = bookings_by_date[week_date]
+                        cache_key = (week_date.weekday(), tuple(day_time_offs), tuple(day_bookings))
+                        daily = daily_slots_cache.get(cache_key)
+                        if daily is None:
+                            daily = daily_slots_cache[cache_key] = get_daily_slots(week_date, availabilities_by_weekday[week_date.weekday()], day_time_offs, day_bookings, service_duration_minutes)
+                        else:
+                            daily = daily.model_copy(update={'date': week_date})
+                        daily_slots.append(daily)
                     week_date += timedelta(days=1)
-                weekly_slots.append(WeeklyAvailability(
+                weekly_slots.append(WeeklyAvailability.model_construct(
                     week_start_date=week_start,
                     week_end_date=week_end,
                     daily_slots=daily_slots
                 ))
                 current_date = week_end + timedelta(days=1)
-            monthly = MonthlyAvailability(
+            monthly = MonthlyAvailability.model_construct(
                 month=date_from.month,
                 year=date_from.year,
                 weekly_slots=weekly_slots
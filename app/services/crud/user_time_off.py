@@ -3,7 +3,7 @@ from datetime import date, datetime
 import uuid
 
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func
+from sqlalchemy import select, func, delete as sa_delete
 from pydantic.v1 import UUID4
 from sqlalchemy.orm import selectinload
 
@@ -116,16 +116,12 @@ async def delete(db: AsyncSession, *, time_off_id: UUID4) -> bool:
     """
     Delete a time off period
     """
-    stmt = select(UserTimeOffs).filter(UserTimeOffs.id == time_off_id)
+    # A single DELETE ... RETURNING instead of loading the row (and its user) first
+    stmt = sa_delete(UserTimeOffs).where(UserTimeOffs.id == time_off_id).returning(UserTimeOffs.id)
     result = await db.execute(stmt)
-    db_obj = result.scalar_one_or_none()
-
-    if not db_obj:
-        return False
-    
-    await db.delete(db_obj)
+    deleted_id = result.scalar_one_or_none()
     await db.commit()
-    return True
+    return deleted_id is not None
 
 
 async def check_overlapping_time_offs(
@@ -139,7 +135,7 @@ async def check_overlapping_time_offs(
     Check if a new time off period overlaps with existing ones
     Returns True if there are overlaps, False otherwise
     """
-    stmt = select(UserTimeOffs).filter(
+    overlapping = select(UserTimeOffs.id).filter(
         UserTimeOffs.user_id == user_id,
         UserTimeOffs.start_date <= end_date,
         UserTimeOffs.end_date >= start_date
@@ -147,11 +143,11 @@ async def check_overlapping_time_offs(
 
     # Exclude the current time off if updating
     if exclude_id:
-        stmt = stmt.filter(UserTimeOffs.id != exclude_id)
+        overlapping = overlapping.filter(UserTimeOffs.id != exclude_id)
 
-    result = await db.execute(stmt)
-    count = len(result.scalars().all())
-    return count > 0
+    # EXISTS stops at the first overlap instead of loading them all
+    result = await db.execute(select(overlapping.exists()))
+    return bool(result.scalar())
 
 
 async def get_company_user_time_offs(
@@ -1,5 +1,5 @@
 import logging
-from typing import Optional
+from typing import List, Optional
 
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
@@ -40,6 +40,5 @@ class NotificationService:
             return False
 
 
-
 # Global instance
 notification_service = NotificationService()
@@ -0,0 +1,96 @@
+import json
+import uuid
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock
+
+import httpx
+import pytest
+from sqlalchemy.exc import IntegrityError
+
+from app.main import app
+from app.api.dependencies import get_current_company_id
+from app.db.session import get_db
+from app.schemas import CategoryServiceCreate
+from app.services.crud import service as crud_service
+
+
+class PgError(Exception):
+    """Stands in for the driver error wrapped by IntegrityError, which carries the SQLSTATE"""
+
+    def __init__(self, pgcode):
+        super().__init__(pgcode)
+        self.pgcode = pgcode
+
+
+def session_rejecting_insert(pgcode):
+    """An async session whose service INSERT fails the way Postgres reports pgcode"""
+    db = MagicMock()
+    db.scalar = AsyncMock(side_effect=IntegrityError("INSERT INTO category_services", {}, PgError(pgcode)))
+    db.rollback = AsyncMock()
+    db.commit = AsyncMock()
+    return db
+
+
+def service_payload(category_id):
+    return {"name": "Haircut", "duration": 30, "price": 2500, "category_id": category_id}
+
+
+@pytest.mark.parametrize("pgcode, message", [
+    ("23514", crud_service.CATEGORY_HAS_SUBCATEGORIES_MESSAGE),
+    ("23503", crud_service.CATEGORY_NOT_FOUND_MESSAGE),
+])
+async def test_create_service_reports_category_violation_as_value_error(pgcode, message):
+    """The leaf category trigger (check_violation) and the category FK become ValueErrors"""
+    db = session_rejecting_insert(pgcode)
+    obj_in = CategoryServiceCreate(**service_payload(str(uuid.uuid4())))
+
+    with pytest.raises(ValueError, match=message):
+        await crud_service.create_service(db=db, obj_in=obj_in)
+    db.rollback.assert_awaited_once()
+    db.commit.assert_not_awaited()
+
+
+async def test_create_service_reraises_other_integrity_errors():
+    """Integrity errors other than the category checks are not reported as bad input"""
+    db = session_rejecting_insert("23505")
+    obj_in = CategoryServiceCreate(**service_payload(str(uuid.uuid4())))
+
+    with pytest.raises(IntegrityError):
+        await crud_service.create_service(db=db, obj_in=obj_in)
+
+
+async def test_create_service_endpoint_returns_400_for_category_with_subcategories(monkeypatch):
+    """A trigger violation reaches the client as a 400 with the subcategories message"""
+    company_id = str(uuid.uuid4())
+    category_id = str(uuid.uuid4())
+    db = session_rejecting_insert("23514")
+
+    async def override_get_db():
+        yield db
+
+    monkeypatch.setattr(crud_service, "get_category",
+                        AsyncMock(return_value=SimpleNamespace(id=category_id, company_id=company_id)))
+    monkeypatch.setitem(app.dependency_overrides, get_db, override_get_db)
+    monkeypatch.setitem(app.dependency_overrides, get_current_company_id, lambda: company_id)
+
+    async with httpx.AsyncClient(transport=httpx.ASGITransport(app=app), base_url="http://test") as client:
+        response = await client.post("/api/v1/services", data={"service_in": json.dumps(service_payload(category_id))})
+
+    body = response.json()
+    assert body["success"] is False
+    assert body["status_code"] == 400
+    assert body["message"] == crud_service.CATEGORY_HAS_SUBCATEGORIES_MESSAGE
+
+
+async def test_company_services_tree_returns_prices_as_floats():
+    """Prices come back from the jsonb aggregate as ints, the API has always returned floats"""
+    service = {"id": str(uuid.uuid4()), "price": 2500, "discount_price": None, "service_staff": []}
+    row = SimpleNamespace(id=uuid.uuid4(), name="Hair", description=None, parent_category_id=None, services=[service])
+    db = MagicMock()
+    db.execute = AsyncMock(return_value=[row])
+
+    tree = await crud_service._load_company_services(db, str(uuid.uuid4()))
+
+    price = tree[0]["services"][0]["price"]
+    assert isinstance(price, float) and price == 2500.0
+    assert tree[0]["services"][0]["discount_price"] is None
@@ -0,0 +1,96 @@
+import uuid
+from datetime import date, datetime, time, timezone
+from types import SimpleNamespace
+
+from app.models.enums import AvailabilityType
+from app.services.crud.user_availability import calculate_availability, subtract_intervals
+
+USER_ID = uuid.uuid4()
+
+
+def working_hours(start=time(9), end=time(18)):
+    """The same working hours on every day of the week"""
+    return [SimpleNamespace(user_id=USER_ID, day_of_week=day, start_time=start, end_time=end) for day in range(7)]
+
+
+def time_off(start, end):
+    """Time-offs reach calculate_availability as (time off, user) rows"""
+    return SimpleNamespace(start_date=start, end_date=end), USER_ID
+
+
+def booking(start, end):
+    return SimpleNamespace(start_at=start, end_at=end)
+
+
+def utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def free_slots(daily):
+    return [(slot.start_time, slot.end_time) for slot in daily.time_slots]
+
+
+def weekly_slots(date_from, time_offs=(), bookings=()):
+    response = calculate_availability(working_hours(), list(time_offs), list(bookings), AvailabilityType.WEEKLY,
+                                      date_from)
+    return {daily.date: free_slots(daily) for daily in response.weekly.daily_slots}
+
+
+def test_subtract_intervals_merges_overlapping_intervals():
+    assert subtract_intervals(540, 1080, [(600, 720), (660, 780), (900, 960)]) == [(540, 600), (780, 900), (960, 1080)]
+
+
+def test_subtract_intervals_past_the_end_of_the_day():
+    assert subtract_intervals(540, 1080, [(1020, 1440)]) == [(540, 1020)]
+
+
+def test_multi_day_time_off_is_clipped_to_each_day():
+    """A time-off from Monday 14:00 to Wednesday 10:00 covers all of Tuesday and Wednesday morning"""
+    slots = weekly_slots(date(2026, 10, 12), time_offs=[time_off(utc(2026, 10, 12, 14), utc(2026, 10, 14, 10))])
+
+    assert slots[date(2026, 10, 12)] == [(time(9), time(14))]
+    assert slots[date(2026, 10, 13)] == []
+    assert slots[date(2026, 10, 14)] == [(time(10), time(18))]
+    assert slots[date(2026, 10, 15)] == [(time(9), time(18))]
+
+
+def test_time_off_starting_before_the_window_is_clipped_to_its_first_day():
+    slots = weekly_slots(date(2026, 10, 12), time_offs=[time_off(utc(2026, 10, 9, 12), utc(2026, 10, 12, 11))])
+
+    assert slots[date(2026, 10, 12)] == [(time(11), time(18))]
+    assert slots[date(2026, 10, 13)] == [(time(9), time(18))]
+
+
+def test_overnight_time_off_in_company_timezone():
+    """20:00-12:00 UTC is 22:00-14:00 in Berlin, so it blocks the next local morning only"""
+    response = calculate_availability(working_hours(), [time_off(utc(2026, 10, 15, 20), utc(2026, 10, 16, 12))], [],
+                                      AvailabilityType.WEEKLY, date(2026, 10, 15), company_timezone="Europe/Berlin")
+    slots = {daily.date: free_slots(daily) for daily in response.weekly.daily_slots}
+
+    assert slots[date(2026, 10, 15)] == [(time(9), time(18))]
+    assert slots[date(2026, 10, 16)] == [(time(14), time(18))]
+
+
+def test_monthly_days_with_the_same_time_off_are_clipped_separately():
+    """Two Mondays covered by one time-off must not share the slots of its first, partly covered day"""
+    response = calculate_availability(working_hours(), [time_off(utc(2026, 10, 5, 12), utc(2026, 10, 13, 0))], [],
+                                      AvailabilityType.MONTHLY, date(2026, 10, 1))
+    slots = {daily.date: free_slots(daily) for week in response.monthly.weekly_slots for daily in week.daily_slots}
+
+    assert slots[date(2026, 10, 5)] == [(time(9), time(12))]
+    assert slots[date(2026, 10, 12)] == []
+    assert slots[date(2026, 10, 13)] == [(time(9), time(18))]
+
+
+def test_overnight_booking_blocks_the_next_morning():
+    slots = weekly_slots(date(2026, 10, 12), bookings=[booking(utc(2026, 10, 15, 23), utc(2026, 10, 16, 11))])
+
+    assert slots[date(2026, 10, 15)] == [(time(9), time(18))]
+    assert slots[date(2026, 10, 16)] == [(time(11), time(18))]
+
+
+def test_booking_ending_at_midnight_leaves_the_next_day_free():
+    slots = weekly_slots(date(2026, 10, 12), bookings=[booking(utc(2026, 10, 15, 17), utc(2026, 10, 16, 0))])
+
+    assert slots[date(2026, 10, 15)] == [(time(9), time(17))]
+    assert slots[date(2026, 10, 16)] == [(time(9), time(18))]